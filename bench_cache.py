@@ -0,0 +1,78 @@
+# bench_cache.py
+# Compares cache backends (load time + bytes on disk) for a 2y universe.
+# Usage: python bench_cache.py [--live]
+#   --live  downloads real 2y bars from Yahoo instead of generating synthetic ones
+import os
+import sys
+import time
+import tempfile
+import pandas as pd
+from src.sectors import get_stocks_by_sector
+from src.synthetic import make_synthetic_bars
+from src.cache_backends import BACKENDS, HAS_PYARROW
+
+def load_universe(live=False):
+    symbols = sorted(get_stocks_by_sector("All"))
+    frames = {}
+    for i, symbol in enumerate(symbols):
+        if live:
+            from src.data_loader import fetch_data
+            df = fetch_data(symbol, period="2y")
+            if df.empty: continue
+            frames[symbol] = df
+        else:
+            frames[symbol] = make_synthetic_bars(seed=i)
+    return frames
+
+def run_benchmark(frames, repeats=3):
+    results = []
+    for name, backend_cls in BACKENDS.items():
+        if name != "csv" and not HAS_PYARROW:
+            print(f"   ⚠️ Skipping {name} (pyarrow not installed)")
+            continue
+        backend = backend_cls()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = {}
+            for symbol, df in frames.items():
+                path = os.path.join(tmp, f"{symbol}_2y.{backend.extension}")
+                backend.save(path, df)
+                paths[symbol] = path
+            total_bytes = sum(os.path.getsize(p) for p in paths.values())
+
+            # Best of N so the first (cold) read doesn't dominate
+            best = float("inf")
+            for _ in range(repeats):
+                start = time.perf_counter()
+                for path in paths.values():
+                    backend.load(path)
+                best = min(best, time.perf_counter() - start)
+
+            # Sanity check: dtypes must survive the round trip
+            sample_symbol = next(iter(paths))
+            loaded = backend.load(paths[sample_symbol])
+            dtypes_ok = loaded.dtypes.equals(frames[sample_symbol].dtypes) and \
+                isinstance(loaded.index, pd.DatetimeIndex)
+
+        results.append({
+            "backend": name,
+            "load_ms": best * 1000,
+            "per_symbol_ms": best * 1000 / len(frames),
+            "kb_on_disk": total_bytes / 1024,
+            "dtypes_ok": dtypes_ok,
+        })
+    return results
+
+if __name__ == "__main__":
+    live = "--live" in sys.argv
+    frames = load_universe(live=live)
+    print(f"📦 Benchmarking cache backends on {len(frames)} symbols (2y, {'live' if live else 'synthetic'})")
+
+    results = run_benchmark(frames)
+    baseline = next((r for r in results if r["backend"] == "csv"), None)
+
+    print(f"{'backend':<10}{'load (ms)':>12}{'per sym (ms)':>15}{'disk (KB)':>12}{'speedup':>10}{'dtypes':>8}")
+    for r in results:
+        speedup = baseline["load_ms"] / r["load_ms"] if baseline else float("nan")
+        print(f"{r['backend']:<10}{r['load_ms']:>12.1f}{r['per_symbol_ms']:>15.2f}"
+              f"{r['kb_on_disk']:>12.1f}{speedup:>9.1f}x{'OK' if r['dtypes_ok'] else 'LOST':>8}")
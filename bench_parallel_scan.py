@@ -0,0 +1,89 @@
+# bench_parallel_scan.py
+# Speedup of the process-pool scan_market against worker count, on a synthetic universe.
+# Every symbol gets an AI model (one small model copied per symbol) so the per-symbol
+# work matches a real scan. Also checks each parallel report equals the serial one.
+# Usage: python bench_parallel_scan.py [--symbols 300] [--bars 250] [--chunk 16] [--repeats 3] [--workers 1,2,4]
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+import src.model_train as model_train
+import src.model_registry as model_registry
+import src.scanner as scanner
+from bench_scan import make_universe
+from src.panel import Panel
+
+def prepare_models(frames):
+    """Trains one model and copies it for every symbol into a temp MODEL_PATH."""
+    model_dir = tempfile.mkdtemp()
+    model_train.MODEL_PATH = model_dir
+    first = next(iter(frames))
+    with contextlib.redirect_stdout(io.StringIO()):
+        model_train.train_model(first, frames[first])
+    source = os.path.join(model_dir, f"{first.replace('.NS', '')}_model.pkl")
+    for symbol in frames:
+        target = os.path.join(model_dir, f"{symbol.replace('.NS', '')}_model.pkl")
+        if target != source:
+            shutil.copyfile(source, target)
+    model_registry.MODELS.model_dir = model_dir # get_scan_pool hands it to the workers
+
+@contextlib.contextmanager
+def silenced():
+    """Mutes stdout at the fd level, so worker processes started inside stay quiet too."""
+    sys.stdout.flush()
+    saved = os.dup(1)
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+    finally:
+        os.dup2(saved, 1)
+        os.close(saved)
+        os.close(devnull)
+
+def timed_scan(panel, symbols, workers, chunk, repeats):
+    best = float("inf")
+    report = None
+    with silenced():
+        scanner.scan_market(panel=panel, symbols=symbols, workers=workers, chunk_size=chunk) # Warm-up (pool start)
+        for _ in range(repeats):
+            start = time.perf_counter()
+            _, report = scanner.scan_market(panel=panel, symbols=symbols, workers=workers, chunk_size=chunk)
+            best = min(best, time.perf_counter() - start)
+    return best, report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parallel scan speedup benchmark")
+    parser.add_argument("--symbols", type=int, default=300)
+    parser.add_argument("--bars", type=int, default=250)
+    parser.add_argument("--chunk", type=int, default=16, help="symbols per worker task")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--workers", help="comma-separated worker counts (default 1,2,4,8 up to the core count)")
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    if args.workers:
+        counts = sorted({1} | {int(w) for w in args.workers.split(",")})
+    else:
+        counts = sorted({1, 2, 4, 8, cores} & set(range(1, cores + 1)))
+    frames = make_universe(args.symbols, args.bars)
+    symbols = list(frames)
+    panel = Panel.from_frames(frames)
+    prepare_models(frames)
+
+    print(f"🏁 scan_market on {args.symbols} symbols x {args.bars} bars, chunk {args.chunk}, {cores} cores")
+    print(f"{'workers':>8}{'time (ms)':>12}{'ms/sym':>10}{'speedup':>10}{'same report':>13}")
+    serial_time, serial_report = None, None
+    for workers in counts:
+        seconds, report = timed_scan(panel, symbols, workers, args.chunk, args.repeats)
+        if serial_time is None:
+            serial_time, serial_report = seconds, report
+        same = report == serial_report
+        print(f"{workers:>8}{seconds * 1000:>12.1f}{seconds * 1000 / len(symbols):>10.2f}"
+              f"{serial_time / seconds:>9.2f}x{'yes' if same else 'NO':>13}")
+        scanner.shutdown_scan_pool()
@@ -0,0 +1,164 @@
+# bench_scan.py
+# Benchmark suite for the indicator / scan path on synthetic OHLCV (fully offline).
+# Times add_indicators, check_breakout, get_market_condition, scan_market and
+# analyze_single_stock, reports time per symbol and peak memory, and saves JSON
+# so runs can be compared between commits.
+# Usage: python bench_scan.py [--symbols 75] [--bars 250] [--repeats 3]
+#                             [--out bench_results/<commit>.json] [--compare old.json]
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import subprocess
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+import src.data_loader as data_loader
+from src import kernels
+from src.indicators import add_indicators, check_breakout
+from src.market_analyzer import get_market_condition
+from src.news_analyzer import NewsAnalyzer
+from src.panel import Panel
+from src.providers import LocalProvider, set_provider
+from src.scanner import scan_market, analyze_single_stock
+from src.synthetic import make_synthetic_bars, symbol_seed
+
+RESULTS_DIR = "bench_results"
+ANALYZE_SAMPLE = 10 # analyze_single_stock is a per-request deep dive, so time a sample
+
+def make_universe(n_symbols, n_bars):
+    """Deterministic synthetic universe: SYN0000.NS, SYN0001.NS, ..."""
+    symbols = [f"SYN{i:04d}.NS" for i in range(n_symbols)]
+    return {s: make_synthetic_bars(n_bars, seed=symbol_seed(s)) for s in symbols}
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=10)
+        return out.stdout.strip() or "unknown"
+    except Exception:
+        return "unknown"
+
+def build_stages(frames):
+    """name -> (function running the whole stage, number of symbols it covers)."""
+    symbols = list(frames)
+    with_indicators = {s: add_indicators(df) for s, df in frames.items()}
+    panel = Panel.from_frames(frames)
+    sample = symbols[:ANALYZE_SAMPLE]
+
+    def run_add_indicators():
+        for df in frames.values():
+            add_indicators(df)
+
+    def run_check_breakout():
+        for df in frames.values():
+            check_breakout(df)
+
+    def run_market_condition():
+        for df in with_indicators.values():
+            get_market_condition(df)
+
+    def run_scan():
+        scan_market(panel=panel, symbols=symbols)
+
+    def run_analyze():
+        for s in sample:
+            analyze_single_stock(s)
+
+    return {
+        "add_indicators": (run_add_indicators, len(symbols)),
+        "check_breakout": (run_check_breakout, len(symbols)),
+        "get_market_condition": (run_market_condition, len(symbols)),
+        "scan_market": (run_scan, len(symbols)),
+        "analyze_single_stock": (run_analyze, len(sample)),
+    }
+
+def measure(func, repeats):
+    """Best-of-N wall time, then one extra run under tracemalloc for the peak allocation."""
+    with contextlib.redirect_stdout(io.StringIO()): # The scanner prints per symbol
+        func() # Warm-up (JIT, imports, caches of the data layer)
+        best = float("inf")
+        for _ in range(repeats):
+            start = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start)
+
+        tracemalloc.start()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return best, peak
+
+def run_benchmark(n_symbols, n_bars, repeats):
+    frames = make_universe(n_symbols, n_bars)
+
+    # Offline data layer: synthetic provider + throwaway cache dir, no news requests
+    set_provider(LocalProvider(root=tempfile.mkdtemp(), synthetic=True, n_bars=n_bars))
+    data_loader.CACHE_DIR = tempfile.mkdtemp()
+    NewsAnalyzer.get_sentiment = lambda self, symbol: (0, [])
+
+    stages = {}
+    for name, (func, n) in build_stages(frames).items():
+        seconds, peak = measure(func, repeats)
+        stages[name] = {
+            "total_ms": round(seconds * 1000, 3),
+            "per_symbol_ms": round(seconds * 1000 / n, 3),
+            "symbols": n,
+            "peak_alloc_mb": round(peak / 1024 / 1024, 2),
+        }
+        print(f"   ⏱️ {name:<22}{seconds * 1000:>10.1f} ms{seconds * 1000 / n:>10.2f} ms/sym"
+              f"{peak / 1024 / 1024:>9.1f} MB peak")
+
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": pd.Timestamp.now().isoformat(),
+            "symbols": n_symbols,
+            "bars": n_bars,
+            "repeats": repeats,
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "numba": kernels.HAS_NUMBA,
+            # ru_maxrss is KB on Linux
+            "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        },
+        "stages": stages,
+    }
+
+def compare(result, baseline_path):
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    print(f"\n📊 vs {baseline_path} (commit {baseline['meta'].get('commit')})")
+    print(f"{'stage':<24}{'before (ms)':>13}{'after (ms)':>13}{'change':>10}")
+    for name, stage in result["stages"].items():
+        old = baseline["stages"].get(name)
+        if old is None:
+            continue
+        change = stage["per_symbol_ms"] / old["per_symbol_ms"] if old["per_symbol_ms"] else float("nan")
+        print(f"{name:<24}{old['total_ms']:>13.1f}{stage['total_ms']:>13.1f}{change:>9.2f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline indicator / scan benchmark")
+    parser.add_argument("--symbols", type=int, default=75, help="universe size")
+    parser.add_argument("--bars", type=int, default=250, help="history length per symbol")
+    parser.add_argument("--repeats", type=int, default=3, help="timed runs per stage (best is kept)")
+    parser.add_argument("--out", help="JSON output path (default bench_results/<commit>.json)")
+    parser.add_argument("--compare", help="previous JSON result to compare against")
+    args = parser.parse_args()
+
+    print(f"🏁 Benchmarking {args.symbols} synthetic symbols x {args.bars} bars")
+    result = run_benchmark(args.symbols, args.bars, args.repeats)
+
+    out = args.out or os.path.join(RESULTS_DIR, f"{result['meta']['commit']}.json")
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(result, f, indent=2)
+    print(f"💾 Saved {out}")
+
+    if args.compare:
+        compare(result, args.compare)
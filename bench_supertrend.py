@@ -0,0 +1,80 @@
+# bench_supertrend.py
+# Microbenchmark: original per-row .iloc SuperTrend loop vs src.kernels.supertrend.
+# ATR(10) is computed once up front and shared, so only the SuperTrend part is timed.
+# Also checks both give identical SuperTrend / SuperTrend_Signal output.
+# Usage: python bench_supertrend.py
+import time
+import numpy as np
+import ta
+from src import kernels
+from src.synthetic import make_synthetic_bars
+
+LENGTHS = [250, 500, 5000, 50000]
+
+def supertrend_reference(df, atr):
+    """The original add_indicators loop, kept verbatim as the parity reference."""
+    high = df['High']
+    low = df['Low']
+    close = df['Close']
+    multiplier = 3
+
+    hl2 = (high + low) / 2
+    final_upperband = hl2 + (multiplier * atr)
+    final_lowerband = hl2 - (multiplier * atr)
+
+    supertrend = [True] * len(df)
+    st_values = [0.0] * len(df)
+
+    for i in range(1, len(df)):
+        if close.iloc[i] > final_upperband.iloc[i-1]:
+            supertrend[i] = True
+        elif close.iloc[i] < final_lowerband.iloc[i-1]:
+            supertrend[i] = False
+        else:
+            supertrend[i] = supertrend[i-1]
+            if supertrend[i] == True and final_lowerband.iloc[i] < final_lowerband.iloc[i-1]:
+                final_lowerband.iloc[i] = final_lowerband.iloc[i-1]
+            if supertrend[i] == False and final_upperband.iloc[i] > final_upperband.iloc[i-1]:
+                final_upperband.iloc[i] = final_upperband.iloc[i-1]
+
+        if supertrend[i]:
+            st_values[i] = final_lowerband.iloc[i]
+        else:
+            st_values[i] = final_upperband.iloc[i]
+    return np.array(st_values), np.array(supertrend)
+
+def run_kernel(df, atr):
+    return kernels.supertrend(df['High'], df['Low'], df['Close'], atr, multiplier=3)
+
+def get_atr(df):
+    return ta.volatility.average_true_range(df['High'], df['Low'], df['Close'], window=10)
+
+def best_of(func, df, atr, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        out = func(df, atr)
+        best = min(best, time.perf_counter() - start)
+    return best, out
+
+if __name__ == "__main__":
+    modes = ["numba", "python"] if kernels.HAS_NUMBA else ["python"]
+    if kernels.HAS_NUMBA:
+        warm = make_synthetic_bars(50)
+        run_kernel(warm, get_atr(warm)) # JIT warm-up
+
+    print(f"{'bars':>8}{'reference (ms)':>16}" + "".join(f"{m + ' (ms)':>16}{'speedup':>10}" for m in modes) + f"{'identical':>11}")
+    for n in LENGTHS:
+        df = make_synthetic_bars(n, seed=n)
+        repeats = 1 if n > 5000 else 3
+        atr = get_atr(df)
+        ref_time, (ref_st, ref_sig) = best_of(supertrend_reference, df, atr.copy(), repeats)
+
+        row = f"{n:>8}{ref_time * 1000:>16.2f}"
+        identical = True
+        for mode in modes:
+            kernels.HAS_NUMBA = (mode == "numba")
+            k_time, (st, sig) = best_of(run_kernel, df, atr, 5)
+            identical &= np.array_equal(st, ref_st, equal_nan=True) and np.array_equal(sig, ref_sig)
+            row += f"{k_time * 1000:>16.3f}{ref_time / k_time:>9.0f}x"
+        print(row + f"{'yes' if identical else 'NO':>11}")
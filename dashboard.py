@@ -3,11 +3,11 @@ import streamlit as st
 import requests
 import pandas as pd
 import plotly.graph_objects as go
-import yfinance as yf
 import time
 from datetime import datetime
 
 import os
+from src.providers import get_provider
 # --- CONFIGURATION ---
 # Default to local, but allow Cloud URL override
 # Default to local, but allow Cloud URL override
@@ -84,8 +84,7 @@ with st.sidebar.expander("🛒 Manual Execution", expanded=True):
         try:
              # Fetch Live Price
              sym = man_symbol if man_symbol.endswith(".NS") else f"{man_symbol}.NS"
-             ticker = yf.Ticker(sym)
-             hist = ticker.history(period='1d')
+             hist = get_provider().history(sym, period='1d')
              curr_price = hist['Close'].iloc[-1]
              
              resp = requests.post(f"{BASE_URL}/trade/{sym}?action={man_action}&qty={man_qty}&price={curr_price}", headers=HEADERS, timeout=10)
@@ -228,10 +227,7 @@ with t2:
                         mc3.caption("Price to exit at no loss")
                 
                 # Chart
-                chart_df = yf.download(sym, period="6mo", progress=False)
-                # Fix MultiIndex if present
-                if isinstance(chart_df.columns, pd.MultiIndex):
-                     chart_df.columns = chart_df.columns.get_level_values(0)
+                chart_df = get_provider().history(sym, period="6mo")
 
                 if not chart_df.empty:
                     fig = go.Figure()
@@ -0,0 +1,97 @@
+# src/async_fetcher.py
+import asyncio
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from src.config import FETCH_CONCURRENCY, FETCH_RETRIES, FETCH_BACKOFF, FETCH_RATE_PER_SEC
+
+class RateLimiter:
+    """
+    Spaces out request starts to at most `rate` per second.
+    Thread-safe and not tied to an event loop, so one limiter per host covers
+    every caller in the process (server threads, scanner, trainer).
+    """
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Books the next free slot and returns how long to wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+            return slot - now
+
+    async def wait(self):
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+# One limiter per remote host
+_LIMITERS = {}
+_LIMITERS_LOCK = threading.Lock()
+
+def get_limiter(host):
+    with _LIMITERS_LOCK:
+        if host not in _LIMITERS:
+            _LIMITERS[host] = RateLimiter(FETCH_RATE_PER_SEC)
+        return _LIMITERS[host]
+
+def backoff_delay(attempt, base=FETCH_BACKOFF):
+    """Exponential backoff with jitter: base * 2^attempt, scaled by 0.5x - 1.5x."""
+    return base * (2 ** attempt) * random.uniform(0.5, 1.5)
+
+async def call_with_retry(func, *args, host="yahoo", retries=FETCH_RETRIES, is_ok=None, **kwargs):
+    """
+    Runs a blocking call (e.g. yf.download) in a worker thread.
+    Retries on exceptions, or when is_ok(result) is False, with jittered backoff.
+    """
+    limiter = get_limiter(host)
+    for attempt in range(retries + 1):
+        await limiter.wait()
+        try:
+            result = await asyncio.to_thread(func, *args, **kwargs)
+            if is_ok is None or is_ok(result):
+                return result
+            error = ValueError("bad result")
+        except Exception as e:
+            error = e
+
+        if attempt == retries:
+            raise error
+        await asyncio.sleep(backoff_delay(attempt))
+
+async def gather_jobs(jobs, concurrency=FETCH_CONCURRENCY, **retry_kwargs):
+    """
+    Runs {key: (func, args, kwargs)} concurrently, at most `concurrency` at a time.
+    Returns {key: result or Exception}.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(key, func, args, kwargs):
+        async with semaphore:
+            try:
+                return key, await call_with_retry(func, *args, **retry_kwargs, **kwargs)
+            except Exception as e:
+                return key, e
+
+    pairs = await asyncio.gather(*(run(k, f, a, kw) for k, (f, a, kw) in jobs.items()))
+    return dict(pairs)
+
+def run_sync(coro):
+    """Runs a coroutine from sync code, even if this thread already has a running loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
+
+def run_jobs(jobs, **kwargs):
+    """Sync wrapper around gather_jobs."""
+    if not jobs:
+        return {}
+    return run_sync(gather_jobs(jobs, **kwargs))
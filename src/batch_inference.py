@@ -0,0 +1,34 @@
+# src/batch_inference.py
+import pandas as pd
+from src.indicators import FEATURES
+from src.model_registry import get_model
+
+def predict_signals(rows):
+    """
+    AI signals for many symbols at once: {symbol: FEATURES values at the latest bar}
+    -> {symbol: predicted class as int}. Symbols are grouped by the model object that
+    serves them and each group is one predict() call, so a model shared by several
+    symbols runs a single vectorized prediction. No model (or a failing one) -> 0.
+    """
+    signals = {symbol: 0 for symbol in rows}
+    groups = {} # id(model) -> (model, symbols, feature rows)
+    for symbol, row in rows.items():
+        try:
+            model = get_model(symbol)
+        except Exception:
+            continue
+        if model is None:
+            continue
+        group = groups.setdefault(id(model), (model, [], []))
+        group[1].append(symbol)
+        group[2].append(row)
+
+    for model, symbols, values in groups.values():
+        # Same column names the model was trained with, so sklearn doesn't warn
+        X = pd.DataFrame(values, columns=FEATURES, index=symbols)
+        try:
+            predicted = model.predict(X)
+        except Exception:
+            continue
+        signals.update((s, int(p)) for s, p in zip(symbols, predicted))
+    return signals
@@ -0,0 +1,69 @@
+# src/cache_backends.py
+import pandas as pd
+
+# Parquet / Arrow need pyarrow. If it's missing we quietly fall back to CSV.
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+
+class CSVBackend:
+    """Plain text cache. Human readable, but every hit re-parses numbers and dates."""
+    name = "csv"
+    extension = "csv"
+
+    def load(self, path):
+        return pd.read_csv(path, index_col=0, parse_dates=True)
+
+    def save(self, path, df):
+        df.to_csv(path)
+
+
+class ParquetBackend:
+    """Columnar, compressed cache. Dtypes and the DatetimeIndex survive the round trip."""
+    name = "parquet"
+    extension = "parquet"
+
+    def load(self, path):
+        return pd.read_parquet(path)
+
+    def save(self, path, df):
+        df.to_parquet(path)
+
+
+class ArrowBackend:
+    """Arrow IPC (Feather v2). Uncompressed, so the fastest to load but bigger on disk."""
+    name = "arrow"
+    extension = "arrow"
+
+    def load(self, path):
+        df = pd.read_feather(path)
+        # Feather can't store an index, so the first column holds the dates
+        return df.set_index(df.columns[0])
+
+    def save(self, path, df):
+        # Column labels must be strings for Feather
+        out = df.reset_index()
+        out.columns = [str(c) for c in out.columns]
+        out.to_feather(path, compression="uncompressed")
+
+
+BACKENDS = {
+    "csv": CSVBackend,
+    "parquet": ParquetBackend,
+    "arrow": ArrowBackend,
+}
+
+
+def get_backend(name="parquet"):
+    """Returns a cache backend by name ('csv', 'parquet' or 'arrow')."""
+    name = (name or "csv").lower()
+    if name not in BACKENDS:
+        print(f"Warning: Unknown cache format '{name}', using CSV.")
+        name = "csv"
+    if name != "csv" and not HAS_PYARROW:
+        print(f"Warning: pyarrow not installed, '{name}' cache unavailable. Using CSV.")
+        name = "csv"
+    return BACKENDS[name]()
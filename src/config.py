@@ -16,6 +16,43 @@ DEFAULT_SYMBOL = "RELIANCE.NS"
 HISTORY_PERIOD = "2y"
 INTERVAL = "1d"
 
+# --- DATA CACHE ---
+# 'parquet' (default), 'arrow' or 'csv'. Parquet/Arrow need pyarrow installed.
+CACHE_FORMAT = os.getenv("CACHE_FORMAT", "parquet")
+# In-process memory tier on top of the disk cache
+MEMORY_CACHE_MB = int(os.getenv("MEMORY_CACHE_MB", "256"))
+MEMORY_CACHE_TTL = int(os.getenv("MEMORY_CACHE_TTL", "900"))  # seconds
+# Memoized indicator / feature frames, keyed by symbol + last bar (src/feature_cache.py)
+FEATURE_CACHE_MB = int(os.getenv("FEATURE_CACHE_MB", "64"))
+# Cache TTL (seconds) per requested period while NSE is open. Outside market hours
+# a daily series holding the last completed session's final bar never goes stale.
+INTRADAY_TTL = {"1d": 60, "5d": 120, "1mo": 300, "1y": 600, "2y": 900}
+
+# --- DATA PROVIDER ---
+# 'yahoo' (live) or 'local' (replays data/replay, synthetic bars for anything missing)
+DATA_PROVIDER = os.getenv("DATA_PROVIDER", "yahoo")
+REPLAY_DIR = os.getenv("REPLAY_DIR", "data/replay")
+REPLAY_LATENCY = float(os.getenv("REPLAY_LATENCY", "0"))  # seconds per download
+
+# --- DATA FETCHING ---
+FETCH_CONCURRENCY = 4        # Batched downloads in flight at once
+FETCH_RETRIES = 3            # Extra attempts after a failed download
+FETCH_BACKOFF = 1.0          # Seconds, doubled on every retry (with jitter)
+FETCH_RATE_PER_SEC = 2.0     # Max request starts per second per host
+
+# --- SCANNER ---
+SCAN_WORKERS = int(os.getenv("SCAN_WORKERS", "1"))        # >1 = process-pool scan
+SCAN_CHUNK_SIZE = int(os.getenv("SCAN_CHUNK_SIZE", "16"))  # Symbols per worker task
+# Precomputed /scan snapshots (src/scan_snapshots.py), refreshed by a background thread
+SNAPSHOT_SECTORS = [s.strip() for s in os.getenv("SNAPSHOT_SECTORS", "All").split(",") if s.strip()]
+SNAPSHOT_INTERVAL = int(os.getenv("SNAPSHOT_INTERVAL", "300"))  # Rescan age (s) while the market is open
+SNAPSHOT_POLL = int(os.getenv("SNAPSHOT_POLL", "30"))           # How often the refresher checks (s)
+
+# --- AI MODELS ---
+MODEL_CACHE_SIZE = int(os.getenv("MODEL_CACHE_SIZE", "256"))  # Loaded models kept in memory
+TRAIN_WORKERS = int(os.getenv("TRAIN_WORKERS", "1"))           # model_train processes
+TRAIN_BATCH_SIZE = int(os.getenv("TRAIN_BATCH_SIZE", "50"))    # Symbols prefetched per batch
+
 # --- UPSTOX CREDENTIALS ---
 ACCESS_TOKEN = os.getenv("UPSTOX_ACCESS_TOKEN")
 CLIENT_ID = os.getenv("UPSTOX_CLIENT_ID")
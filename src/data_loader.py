@@ -1,70 +1,381 @@
 # src/data_loader.py
-import yfinance as yf
+import numpy as np
 import pandas as pd
 import os
-import time
+import threading
+from datetime import datetime
+from src.config import CACHE_FORMAT, HISTORY_PERIOD, MEMORY_CACHE_MB, MEMORY_CACHE_TTL, INTRADAY_TTL
+from src.cache_backends import get_backend
+from src.periods import get_period_start
+from src.memory_cache import MemoryCache
+from src.single_flight import SingleFlight
+from src.async_fetcher import call_with_retry, run_jobs, run_sync
+from src.providers import get_provider
+from src.market_calendar import IST, OPEN, now_ist, session_state, is_session_final
 
 # Create cache directory if it doesn't exist
 CACHE_DIR = "data/cache"
 if not os.path.exists(CACHE_DIR):
     os.makedirs(CACHE_DIR)
 
+# Storage format for cached bars (Parquet by default, CSV if pyarrow is missing)
+CACHE_BACKEND = get_backend(CACHE_FORMAT)
+
+# Fallback freshness when the calendar can't say the data is final (15 minutes)
+CACHE_TTL = 900
+
+# Memory tier: canonical histories we loaded recently, so repeat calls skip the disk.
+# Each entry remembers the mtime of the file it came from, so writes by other processes are noticed.
+MEMORY_CACHE = MemoryCache(max_bytes=MEMORY_CACHE_MB * 1024 * 1024, default_ttl=MEMORY_CACHE_TTL)
+_MEMORY_MTIMES = {}
+
+# Coalesces concurrent downloads of the same symbol (e.g. /scan and /analyze overlapping)
+FLIGHTS = SingleFlight()
+
+# One canonical history per symbol. Shorter periods are served as slices of it.
+CANONICAL_PERIOD = HISTORY_PERIOD
+
+# Max symbols per yf.download call in fetch_data_many
+BATCH_SIZE = 25
+
+# Relative change in a stored bar's Close / Volume that counts as the provider rewriting history
+REVISION_RTOL = 1e-4
+
+def get_cache_path(symbol):
+    return f"{CACHE_DIR}/{symbol}.{CACHE_BACKEND.extension}"
+
+def is_served_from_store(period):
+    """True if the canonical history is long enough to answer this period."""
+    now = pd.Timestamp.now()
+    start = get_period_start(period, now)
+    return start is not None and start >= get_period_start(CANONICAL_PERIOD, now)
+
+def slice_period(df, period):
+    """
+    Cuts the canonical history down to the requested period (counted back from the last bar).
+    Always returns a copy, so callers can add columns without touching cached frames.
+    """
+    if df.empty:
+        return df.copy()
+    start = get_period_start(period, df.index[-1])
+    if start is None:
+        return df.copy()
+    return df[df.index > start].copy()
+
+def load_stored_data(symbol):
+    """Loads whatever bars we have stored for the symbol, fresh or stale."""
+    file_path = get_cache_path(symbol)
+    if not os.path.exists(file_path):
+        return None
+    try:
+        df = CACHE_BACKEND.load(file_path)
+        return df if not df.empty else None
+    except:
+        return None # If file is corrupt, re-download
+
+def remember(symbol, df):
+    """Puts a canonical history in the memory tier, tagged with its file's mtime."""
+    try:
+        _MEMORY_MTIMES[symbol] = os.path.getmtime(get_cache_path(symbol))
+    except OSError:
+        return
+    MEMORY_CACHE.put(symbol, df)
+
+def get_cache_stats():
+    return {"memory": MEMORY_CACHE.stats(), "downloads": FLIGHTS.stats()}
+
+def get_stored_data(symbol):
+    """Canonical history from memory (if it still matches the file), else disk. Fresh or stale."""
+    file_path = get_cache_path(symbol)
+    if not os.path.exists(file_path):
+        return None
+
+    stored = MEMORY_CACHE.get(symbol)
+    if stored is not None and _MEMORY_MTIMES.get(symbol) == os.path.getmtime(file_path):
+        return stored
+
+    stored = load_stored_data(symbol)
+    if stored is not None:
+        remember(symbol, stored)
+    return stored
+
+def is_fresh(stored, fetched_at, period):
+    """
+    Cache freshness driven by the NSE calendar.
+    1. Market open -> today's bar is still forming, refresh after INTRADAY_TTL[period]
+    2. Closed, and the last bar is the final bar of the latest completed session -> nothing can change
+    3. Closed but not final yet (Yahoo still settling, suspended stock) -> refresh after CACHE_TTL
+    """
+    now = now_ist()
+    age = now.timestamp() - fetched_at
+
+    if session_state(now) == OPEN:
+        return age < INTRADAY_TTL.get(period, CACHE_TTL)
+
+    last_bar = stored.index[-1]
+    last_bar_day = (last_bar.tz_convert(IST) if last_bar.tz else last_bar).date()
+    if is_session_final(last_bar_day, datetime.fromtimestamp(fetched_at, IST), now):
+        return True
+
+    return age < CACHE_TTL
+
 def get_cached_data(symbol, period):
-    """Checks for fresh data (less than 15 mins old) in the cache."""
-    file_path = f"{CACHE_DIR}/{symbol}_{period}.csv"
-    
-    if os.path.exists(file_path):
-        # Check file age (15 minutes = 900 seconds)
-        file_age = time.time() - os.path.getmtime(file_path)
-        
-        if file_age < 900: 
-            # Data is fresh! Load it.
-            try:
-                # Read CSV and ensure index is Datetime
-                df = pd.read_csv(file_path, index_col=0, parse_dates=True)
-                return df
-            except:
-                pass # If file is corrupt, re-download
-    
-    return None
-
-def save_to_cache(symbol, period, df):
-    """Saves the dataframe to a CSV file."""
-    file_path = f"{CACHE_DIR}/{symbol}_{period}.csv"
+    """Returns the cached slice (memory, then disk) if it's still fresh for this period."""
+    stored = get_stored_data(symbol)
+    if stored is None:
+        return None
+
+    if not is_fresh(stored, _MEMORY_MTIMES.get(symbol, 0), period):
+        return None
+    return slice_period(stored, period)
+
+def save_to_cache(symbol, df):
+    """Saves the symbol's canonical history using the configured cache backend."""
+    file_path = get_cache_path(symbol)
+    # Write to a temp file and swap it in, so readers never see a half-written file
+    tmp_path = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
     try:
-        df.to_csv(file_path)
+        CACHE_BACKEND.save(tmp_path, df)
+        os.replace(tmp_path, file_path)
+        remember(symbol, df)
     except Exception as e:
         print(f"Warning: Could not cache {symbol}: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
 
-def fetch_data(symbol, period="1mo"):
+def download_bars(symbol, **kwargs):
+    """Downloads bars from the data provider (pass period= or start=), rate limited and retried on errors."""
+    return run_sync(call_with_retry(get_provider().history, symbol, **kwargs))
+
+def merge_bars(stored, new):
+    """Appends new candles. On overlap the new row wins (the old last bar was usually partial)."""
+    merged = pd.concat([stored, new])
+    merged = merged[~merged.index.duplicated(keep='last')]
+    return merged.sort_index()
+
+def can_fill_gap(stored):
+    """True if the stored bars are recent enough that downloading the gap beats a full refresh."""
+    if len(stored) < 2:
+        return False # No completed bar to check the gap against
+    last_ts = stored.index[-1]
+    return last_ts >= get_period_start(CANONICAL_PERIOD, pd.Timestamp.now(tz=last_ts.tz))
+
+def gap_start(stored):
     """
-    Fetches stock data with Caching.
-    1. Checks Cache -> 2. Downloads from Yahoo -> 3. Saves to Cache
+    Where a gap download starts: one bar before the last stored bar. The last bar may be
+    partial (so it gets overwritten); the one before it is complete and is the overlap
+    used to check the provider hasn't rewritten history (is_history_revised).
+    """
+    return stored.index[-2]
+
+def is_history_revised(stored, new):
+    """
+    True if the overlapping bar differs from what we stored. Yahoo returns split / bonus /
+    dividend adjusted prices, so after a corporate action every old bar changes and the
+    gap can't just be appended.
     """
-    # 1. Try Cache First
-    cached_df = get_cached_data(symbol, period)
-    if cached_df is not None:
-        # print(f"🚀 Cache Hit: {symbol}") # Uncomment for debugging
-        return cached_df
+    anchor = gap_start(stored)
+    if anchor not in new.index:
+        return True
+    old = stored.loc[anchor, ['Close', 'Volume']].to_numpy(dtype=np.float64)
+    fresh = new.loc[anchor, ['Close', 'Volume']].to_numpy(dtype=np.float64)
+    return not np.allclose(fresh, old, rtol=REVISION_RTOL, atol=0, equal_nan=True)
 
-    # 2. Download from Yahoo
+def store_gap(symbol, stored, new):
+    """
+    Merges freshly downloaded gap bars into the store and saves it.
+    Returns None if the provider revised old bars (a full re-download is needed).
+    """
+    if new is None or new.empty:
+        # Nothing new (holiday / weekend). Mark the store as checked.
+        os.utime(get_cache_path(symbol))
+        remember(symbol, stored)
+        return stored
+
+    if is_history_revised(stored, new):
+        print(f"🔁 {symbol}: history was adjusted (split / dividend?), re-downloading")
+        return None
+
+    merged = slice_period(merge_bars(stored, new), CANONICAL_PERIOD)
+    save_to_cache(symbol, merged)
+    return merged
+
+def update_stored_data(symbol, stored):
+    """
+    Brings a stale bar store up to date by downloading only the gap.
+    Returns the merged frame, or None if a full re-download is needed.
+    """
+    # Too far behind -> cheaper to just re-download the whole history
+    if not can_fill_gap(stored):
+        return None
+
+    # Start one bar before the last stored one: overwrites a partial candle and
+    # overlaps a completed bar to detect adjusted history
+    new = download_bars(symbol, start=gap_start(stored).strftime("%Y-%m-%d"))
+    return store_gap(symbol, stored, new)
+
+def refresh_symbol(symbol):
+    """Brings the canonical history up to date (gap or full download). Empty frame if Yahoo had nothing."""
+    # Stale cache? Only ask Yahoo for the candles we're missing
+    stored = get_stored_data(symbol)
+    if stored is not None:
+        updated = update_stored_data(symbol, stored)
+        if updated is not None:
+            return updated
+
+    # Full download of the canonical history
     # print(f"📉 Downloading {symbol}...")
+    df = download_bars(symbol, period=CANONICAL_PERIOD)
+    if not df.empty:
+        save_to_cache(symbol, df)
+    return df
+
+def fetch_data(symbol, period="1mo"):
+    """
+    Fetches stock data with Caching.
+    Every period up to CANONICAL_PERIOD is a slice of one stored history per symbol.
+    1. Checks Cache -> 2. Downloads only missing bars -> 3. Full download if nothing stored
+    Concurrent callers for the same symbol share one download and one cache write.
+    """
     try:
-        df = yf.download(symbol, period=period, progress=False)
-        
-        # Flatten MultiIndex (Fixes empty charts issue)
-        if isinstance(df.columns, pd.MultiIndex):
-            df.columns = df.columns.get_level_values(0)
-            
-        # Basic validation
-        if df.empty:
-            return df
-            
-        # 3. Save to Cache
-        save_to_cache(symbol, period, df)
-        
-        return df
-        
+        # Longer than we keep? Go straight to Yahoo.
+        if not is_served_from_store(period):
+            return FLIGHTS.do((symbol, period), download_bars, symbol, period=period).copy()
+
+        # 1. Try Cache First
+        cached_df = get_cached_data(symbol, period)
+        if cached_df is not None:
+            # print(f"🚀 Cache Hit: {symbol}") # Uncomment for debugging
+            return cached_df
+
+        # 2. / 3. Refresh, or wait for the refresh another thread already started
+        df = FLIGHTS.do(symbol, refresh_symbol, symbol)
+        return slice_period(df, period)
+
     except Exception as e:
         print(f"❌ Error fetching {symbol}: {e}")
-        return pd.DataFrame()
\ No newline at end of file
+        return pd.DataFrame()
+
+def download_many(symbols, **kwargs):
+    """Downloads several tickers in one request and splits the result into {symbol: frame}."""
+    df = get_provider().download(symbols, group_by="ticker", threads=True, **kwargs)
+    frames = {}
+    if df.empty:
+        return frames
+
+    # With group_by="ticker" the columns are (Ticker, Price)
+    tickers = df.columns.get_level_values(0) if isinstance(df.columns, pd.MultiIndex) else []
+    for symbol in symbols:
+        if symbol not in tickers:
+            continue
+        sub = df[symbol].dropna(how="all")
+        sub.columns.name = None
+        if not sub.empty:
+            frames[symbol] = sub
+    return frames
+
+def download_batches(requests, is_ok=None):
+    """
+    Runs one download_many call per (batch, kwargs) request through the async
+    fetcher (bounded concurrency, per-host rate limit, retries with backoff).
+    Returns [(batch, {symbol: frame} or Exception)].
+    """
+    jobs = {tuple(batch): (download_many, (list(batch),), kwargs) for batch, kwargs in requests}
+    results = run_jobs(jobs, is_ok=is_ok)
+    return [(list(key), result) for key, result in results.items()]
+
+def fetch_data_many(symbols, period="1mo", batch_size=BATCH_SIZE):
+    """
+    Batched version of fetch_data. Returns {symbol: DataFrame} for every symbol
+    (empty frame if Yahoo had nothing). Batches are downloaded concurrently.
+    1. Cache hits -> 2. One gap download per batch of stale symbols -> 3. One full download per batch of misses
+    """
+    symbols = list(dict.fromkeys(symbols)) # dedupe, keep order
+    results = {}
+    stale = {}
+    missing = []
+
+    def chunks(items):
+        return [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+
+    # Longer than we keep? Batch download without touching the store.
+    if not is_served_from_store(period):
+        requests = [(batch, {"period": period}) for batch in chunks(symbols)]
+        for batch, frames in download_batches(requests):
+            if isinstance(frames, Exception):
+                print(f"❌ Error fetching batch {batch[0]}..: {frames}")
+                continue
+            results.update(frames)
+        return {symbol: results.get(symbol, pd.DataFrame()) for symbol in symbols}
+
+    # 1. Sort symbols into fresh / stale / missing
+    for symbol in symbols:
+        cached_df = get_cached_data(symbol, period)
+        if cached_df is not None:
+            results[symbol] = cached_df
+            continue
+        stored = get_stored_data(symbol)
+        if stored is not None and can_fill_gap(stored):
+            stale[symbol] = stored
+        else:
+            missing.append(symbol)
+
+    # Symbols another thread is already downloading: wait for those instead
+    owned = set()
+    waiting = {}
+    for symbol in list(stale) + missing:
+        call, is_leader = FLIGHTS.claim(symbol)
+        if is_leader:
+            owned.add(symbol)
+        else:
+            waiting[symbol] = call
+    stale = {s: df for s, df in stale.items() if s in owned}
+    missing = [s for s in missing if s in owned]
+    refreshed = {}
+
+    try:
+        # 2. Stale: download only the gap, starting at the oldest gap_start in each batch
+        # (batches are grouped by start date so each one is a single request)
+        requests = []
+        for batch in chunks(sorted(stale, key=lambda s: gap_start(stale[s]))):
+            start = min(gap_start(stale[s]) for s in batch)
+            requests.append((batch, {"start": start.strftime("%Y-%m-%d")}))
+        for batch, new_frames in download_batches(requests):
+            if isinstance(new_frames, Exception):
+                print(f"❌ Error updating batch {batch[0]}..: {new_frames}")
+                missing.extend(batch)
+                continue
+            for symbol in batch:
+                merged = store_gap(symbol, stale[symbol], new_frames.get(symbol))
+                if merged is None:
+                    missing.append(symbol) # Adjusted history -> full download below
+                else:
+                    refreshed[symbol] = merged
+
+        # 3. Missing: full canonical history download (an empty answer counts as a failure)
+        requests = [(batch, {"period": CANONICAL_PERIOD}) for batch in chunks(missing)]
+        for batch, frames in download_batches(requests, is_ok=bool):
+            if isinstance(frames, Exception):
+                print(f"❌ Error fetching batch {batch[0]}..: {frames}")
+                continue
+            for symbol in batch:
+                df = frames.get(symbol)
+                if df is None:
+                    continue
+                save_to_cache(symbol, df)
+                refreshed[symbol] = df
+    finally:
+        # Always release our claims, or waiting threads would hang
+        for symbol in owned:
+            FLIGHTS.finish(symbol, result=refreshed.get(symbol, pd.DataFrame()))
+
+    for symbol, call in waiting.items():
+        try:
+            refreshed[symbol] = FLIGHTS.wait(call)
+        except Exception:
+            pass # The other thread already reported it
+
+    for symbol, df in refreshed.items():
+        results[symbol] = slice_period(df, period)
+
+    return {symbol: results.get(symbol, pd.DataFrame()) for symbol in symbols}
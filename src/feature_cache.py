@@ -0,0 +1,45 @@
+# src/feature_cache.py
+import pandas as pd
+from src.config import FEATURE_CACHE_MB
+from src.indicators import add_indicators, add_model_features
+from src.memory_cache import MemoryCache
+
+# Keys carry the last bar, so entries never go stale: new data -> new key.
+# The TTL only bounds how long superseded entries linger before the LRU drops them.
+FEATURE_CACHE = MemoryCache(max_bytes=FEATURE_CACHE_MB * 1024 * 1024, default_ttl=6 * 3600)
+
+def cache_key(symbol, df, spec):
+    """
+    (symbol, last bar timestamp, spec), plus the bar count and the last bar's close / volume
+    so a live candle that is still changing under the same timestamp is not served stale.
+    A missing close / volume becomes None: NaN never equals itself, so it would never hit.
+    """
+    last = df.iloc[-1]
+    close, volume = (None if pd.isna(v) else float(v) for v in (last['Close'], last['Volume']))
+    return (symbol, df.index[-1], len(df), close, volume, spec)
+
+def memoize(symbol, df, spec, func):
+    """
+    Returns func(df), computed once per (symbol, last bar, spec).
+    spec must identify what func computes (name + parameters). Callers get a copy.
+    """
+    if df.empty:
+        return func(df)
+    key = cache_key(symbol, df, spec)
+    out = FEATURE_CACHE.get(key)
+    if out is None:
+        out = func(df)
+        FEATURE_CACHE.put(key, out)
+    return out.copy()
+
+def get_indicators(symbol, df, columns=None):
+    """add_indicators(df, columns), memoized."""
+    spec = ("add_indicators", None if columns is None else tuple(columns))
+    return memoize(symbol, df, spec, lambda frame: add_indicators(frame, columns))
+
+def get_model_features(symbol, df):
+    """add_model_features(df), memoized."""
+    return memoize(symbol, df, "model_features", add_model_features)
+
+def get_feature_cache_stats():
+    return FEATURE_CACHE.stats()
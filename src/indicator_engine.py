@@ -0,0 +1,379 @@
+# src/indicator_engine.py
+import copy
+import json
+import math
+import os
+from collections import deque
+import pandas as pd
+
+# Same columns add_indicators() produces
+COLUMNS = ['RSI', 'EMA_Fast', 'EMA_Slow', 'MACD', 'ATR', 'BB_High', 'BB_Low', 'ADX',
+           'VWAP', 'OBV', 'SuperTrend', 'SuperTrend_Signal', 'Stoch_K']
+
+STATE_DIR = "data/indicator_state"
+
+NAN = float("nan")
+
+class IndicatorEngine:
+    """
+    Streaming version of indicators.add_indicators for one symbol.
+    Keeps the recursive state (Wilder smoothing, EMAs, rolling windows, SuperTrend bands)
+    so a new bar costs O(1) instead of recomputing the whole history.
+    Values match add_indicators (same 'ta' conventions, warm-up zeros and NaNs, same
+    handling of NaN bars) to floating-point tolerance.
+    """
+    def __init__(self):
+        self.n = 0                 # Bars seen
+        self.prev = None           # Previous bar (high, low, close)
+        self.last_time = None      # Timestamp of the last bar (ISO string)
+        self._undo = None          # State before the last bar, for replacing a partial candle
+
+        # RSI (Wilder EMA of up / down moves)
+        self.rsi_up = 0.0
+        self.rsi_dn = 0.0
+        # Close EMAs: 8 / 21 for the chart, 12 / 26 for MACD (pandas ewm, adjust=False:
+        # the weight of the running mean decays over NaN bars, count = valid closes seen)
+        self.ema = {8: None, 21: None, 12: None, 26: None}
+        self.ema_weight = {8: 1.0, 21: 1.0, 12: 1.0, 26: 1.0}
+        self.ema_count = 0
+        # ta-style ATR: mean of the first `window` (valid) true ranges, then Wilder smoothing
+        self.atr = {14: {"sum": 0.0, "count": 0, "value": 0.0},
+                    10: {"sum": 0.0, "count": 0, "value": 0.0}}
+        # Rolling windows (ring buffers)
+        self.closes = deque(maxlen=20)
+        self.volumes = deque(maxlen=20)
+        self.pv = deque(maxlen=20)
+        self.highs = deque(maxlen=14)
+        self.lows = deque(maxlen=14)
+        # OBV
+        self.obv = 0.0
+        # ADX (14): smoothed true range / +DM / -DM and the DX warm-up.
+        # Warm-up bars are kept until bar 2 * 14 - 1, see _adx_warm_up()
+        self.adx_bars = []
+        self.adx_tr = 0.0
+        self.adx_pos = 0.0
+        self.adx_neg = 0.0
+        self.adx = 0.0
+        # SuperTrend band state
+        self.st_upper = None
+        self.st_lower = None
+        self.st_trend = True
+
+    # --- helpers ---
+
+    def _ema_step(self, span, x):
+        """One step of kernels.ewm_mean: a NaN close keeps the mean but decays its weight."""
+        alpha = 2 / (span + 1)
+        mean = self.ema[span]
+        if mean is None:
+            if not math.isnan(x):
+                self.ema[span] = x
+            return
+        self.ema_weight[span] *= 1 - alpha
+        if not math.isnan(x):
+            old_wt = self.ema_weight[span]
+            if mean != x:
+                self.ema[span] = (old_wt * mean + alpha * x) / (old_wt + alpha)
+            self.ema_weight[span] = 1.0
+
+    def _atr_step(self, window, tr):
+        state = self.atr[window]
+        if self.n < window:
+            # Starting mean skips NaN true ranges (kernels.nan_mean)
+            if not math.isnan(tr):
+                state["sum"] += tr
+                state["count"] += 1
+            if self.n == window - 1:
+                state["value"] = state["sum"] / state["count"] if state["count"] else NAN
+        else:
+            # Like ta, a NaN bar after the warm-up turns the rest NaN
+            state["value"] = (state["value"] * (window - 1) + tr) / float(window)
+        return state["value"]
+
+    @staticmethod
+    def _dx(tr, pos, neg):
+        dip = 100 * (pos / tr) if tr != 0 else 0.0
+        din = 100 * (neg / tr) if tr != 0 else 0.0
+        return 100 * abs((dip - din) / (dip + din)) if dip + din != 0 else 0.0
+
+    def _adx_warm_up(self, w):
+        """
+        First ADX value from the bars kept so far (bars 1 .. 2w-1), as kernels.adx does it:
+        each smoothed sum starts from the sum of its first w valid values, then runs
+        x - x/w + new from bar w on; ADX starts as the mean DX of bars w .. 2w-1.
+        With fewer than w valid values by then, the sums use what there is
+        (kernels.adx would take later bars too, which a stream doesn't have yet).
+        """
+        def first_valid_sum(values):
+            return sum([v for v in values if not math.isnan(v)][:w])
+        columns = list(zip(*self.adx_bars))
+        self.adx_tr, self.adx_pos, self.adx_neg = (first_valid_sum(c) for c in columns)
+        dx_sum = 0.0
+        for bar, (ddm, pos, neg) in enumerate(self.adx_bars, start=1):
+            if bar < w:
+                continue
+            if bar > w:
+                self.adx_tr = self.adx_tr - (self.adx_tr / float(w)) + ddm
+                self.adx_pos = self.adx_pos - (self.adx_pos / float(w)) + pos
+                self.adx_neg = self.adx_neg - (self.adx_neg / float(w)) + neg
+            dx_sum += self._dx(self.adx_tr, self.adx_pos, self.adx_neg)
+        self.adx = dx_sum / w
+        self.adx_bars = []
+
+    @staticmethod
+    def _fmax(a, b):
+        """max() that ignores a NaN side, like np.fmax."""
+        if math.isnan(a):
+            return b
+        if math.isnan(b):
+            return a
+        return max(a, b)
+
+    @staticmethod
+    def _window_full(values, size):
+        return len(values) == size
+
+    @staticmethod
+    def _window_min(values):
+        return NAN if any(math.isnan(v) for v in values) else min(values)
+
+    @staticmethod
+    def _window_max(values):
+        return NAN if any(math.isnan(v) for v in values) else max(values)
+
+    # --- public API ---
+
+    def update(self, open_, high, low, close, volume, timestamp=None, replace_last=False):
+        """
+        Advances the engine by one bar and returns that bar's indicator values (dict).
+        replace_last=True re-does the previous bar instead (e.g. the intraday candle changed).
+        """
+        if replace_last and self._undo is not None:
+            self.__dict__.update(self._undo)
+        self._undo = {k: copy.deepcopy(v) for k, v in self.__dict__.items() if k != "_undo"}
+
+        high, low, close, volume = float(high), float(low), float(close), float(volume)
+        t = self.n
+        out = {}
+
+        # RSI (14). A move from or to a NaN close counts as no move (kernels.rsi)
+        if self.prev is not None:
+            diff = close - self.prev[2]
+            up, dn = (diff if diff > 0 else 0.0), (-diff if diff < 0 else 0.0)
+            alpha = 1 / 14
+            self.rsi_up = (1 - alpha) * self.rsi_up + alpha * up
+            self.rsi_dn = (1 - alpha) * self.rsi_dn + alpha * dn
+        if t < 13:
+            out['RSI'] = NAN
+        elif self.rsi_dn == 0:
+            out['RSI'] = 100.0
+        else:
+            out['RSI'] = 100 - (100 / (1 + self.rsi_up / self.rsi_dn))
+
+        # EMAs + MACD
+        for span in self.ema:
+            self._ema_step(span, close)
+        if not math.isnan(close):
+            self.ema_count += 1
+        count = self.ema_count
+        out['EMA_Fast'] = self.ema[8] if count >= 8 else NAN
+        out['EMA_Slow'] = self.ema[21] if count >= 21 else NAN
+        out['MACD'] = self.ema[12] - self.ema[26] if count >= 26 else NAN
+
+        # True range (first bar has no previous close)
+        if self.prev is None:
+            tr = high - low
+        else:
+            prev_close = self.prev[2]
+            tr = self._fmax(high - low, self._fmax(abs(high - prev_close), abs(low - prev_close)))
+        out['ATR'] = self._atr_step(14, tr)
+        atr10 = self._atr_step(10, tr)
+
+        # Bollinger Bands (20, 2) + rolling VWAP (20). A NaN in the window makes them NaN
+        # (kernels.rolling), which plain sums already do
+        self.closes.append(close)
+        self.volumes.append(volume)
+        self.pv.append(close * volume)
+        if self._window_full(self.closes, 20):
+            mean = sum(self.closes) / 20
+            std = math.sqrt(sum((c - mean) ** 2 for c in self.closes) / 20)
+            out['BB_High'] = mean + 2 * std
+            out['BB_Low'] = mean - 2 * std
+            out['VWAP'] = sum(self.pv) / sum(self.volumes)
+        else:
+            out['BB_High'] = out['BB_Low'] = out['VWAP'] = NAN
+
+        # ADX (14), following ta's ADXIndicator exactly. NaN bars are skipped in the
+        # starting sums; after the warm-up a NaN turns the rest NaN, as in ta
+        w = 14
+        if self.prev is not None:
+            prev_high, prev_low, prev_close = self.prev
+            if math.isnan(high) or math.isnan(low) or math.isnan(prev_close):
+                ddm = NAN
+            else:
+                ddm = max(high, prev_close) - min(low, prev_close)
+            diff_up = high - prev_high
+            diff_down = prev_low - low
+            pos = diff_up if (diff_up > diff_down and diff_up > 0) else 0.0
+            neg = diff_down if (diff_down > diff_up and diff_down > 0) else 0.0
+            if math.isnan(diff_up):
+                pos = NAN
+            if math.isnan(diff_down):
+                neg = NAN
+            if t <= 2 * w - 1:
+                self.adx_bars.append((ddm, pos, neg))
+            else:
+                self.adx_tr = self.adx_tr - (self.adx_tr / float(w)) + ddm
+                self.adx_pos = self.adx_pos - (self.adx_pos / float(w)) + pos
+                self.adx_neg = self.adx_neg - (self.adx_neg / float(w)) + neg
+        if t == 2 * w - 1:
+            self._adx_warm_up(w)
+        elif t > 2 * w - 1:
+            dx = self._dx(self.adx_tr, self.adx_pos, self.adx_neg)
+            self.adx = ((self.adx * (w - 1)) + dx) / float(w)
+        out['ADX'] = self.adx
+
+        # OBV (ta counts an unchanged close as up-volume). A NaN volume is NaN on its bar
+        # and leaves the running total alone (kernels.obv)
+        if math.isnan(volume):
+            out['OBV'] = NAN
+        else:
+            if self.prev is not None and close < self.prev[2]:
+                self.obv -= volume
+            else:
+                self.obv += volume
+            out['OBV'] = self.obv
+
+        # SuperTrend (10, 3)
+        hl2 = (high + low) / 2
+        upper = hl2 + (3 * atr10)
+        lower = hl2 - (3 * atr10)
+        if self.st_upper is None:
+            self.st_trend = True
+            out['SuperTrend'] = 0.0
+        else:
+            if close > self.st_upper:
+                self.st_trend = True
+            elif close < self.st_lower:
+                self.st_trend = False
+            else:
+                if self.st_trend and lower < self.st_lower:
+                    lower = self.st_lower
+                if not self.st_trend and upper > self.st_upper:
+                    upper = self.st_upper
+            out['SuperTrend'] = lower if self.st_trend else upper
+        self.st_upper, self.st_lower = upper, lower
+        out['SuperTrend_Signal'] = self.st_trend
+
+        # Stochastic %K (14). NaN while the window holds a NaN bar (kernels.rolling);
+        # min() / max() alone would depend on where the NaN sits
+        self.highs.append(high)
+        self.lows.append(low)
+        if self._window_full(self.highs, 14):
+            smin, smax = self._window_min(self.lows), self._window_max(self.highs)
+            out['Stoch_K'] = 100 * (close - smin) / (smax - smin) if smax != smin else NAN
+        else:
+            out['Stoch_K'] = NAN
+
+        self.prev = (high, low, close)
+        self.n += 1
+        if timestamp is not None:
+            self.last_time = pd.Timestamp(timestamp).isoformat()
+        return out
+
+    def update_frame(self, df):
+        """
+        Advances by a batch of bars. Bars at or before the last one seen are skipped,
+        except the last bar itself, which is replaced (partial candle).
+        Returns df's new rows with the indicator columns added.
+        """
+        rows = []
+        index = []
+        last = pd.Timestamp(self.last_time) if self.last_time else None
+        for ts, o, h, l, c, v in zip(df.index, df['Open'], df['High'], df['Low'], df['Close'], df['Volume']):
+            if last is not None and ts < last:
+                continue
+            replace = last is not None and ts == last
+            rows.append(self.update(o, h, l, c, v, timestamp=ts, replace_last=replace))
+            index.append(ts)
+            last = ts
+
+        out = df.loc[df.index.isin(index)].copy()
+        out = out[~out.index.duplicated(keep='last')]
+        values = pd.DataFrame(rows, index=index, columns=COLUMNS)
+        values = values[~values.index.duplicated(keep='last')]
+        for col in COLUMNS:
+            out[col] = values[col].to_numpy()
+        out['SuperTrend_Signal'] = out['SuperTrend_Signal'].astype(bool)
+        return out
+
+    # --- persistence ---
+
+    def _encode(self, state):
+        """JSON-friendly copy of an engine state (deques -> lists, int keys -> str)."""
+        out = {}
+        for key, value in state.items():
+            if isinstance(value, deque):
+                value = list(value)
+            elif key in ("ema", "ema_weight", "atr"):
+                value = {str(k): copy.copy(v) for k, v in value.items()}
+            out[key] = value
+        return out
+
+    def _decode(self, state):
+        out = {}
+        for key, value in state.items():
+            current = getattr(self, key, None)
+            if isinstance(current, deque):
+                value = deque(value, maxlen=current.maxlen)
+            elif key in ("ema", "ema_weight", "atr"):
+                value = {int(k): v for k, v in value.items()}
+            elif key == "prev" and value is not None:
+                value = tuple(value)
+            elif key == "adx_bars":
+                value = [tuple(bar) for bar in value]
+            out[key] = value
+        return out
+
+    def to_dict(self):
+        state = self._encode({k: v for k, v in self.__dict__.items() if k != "_undo"})
+        state["_undo"] = self._encode(self._undo) if self._undo is not None else None
+        return state
+
+    @classmethod
+    def from_dict(cls, state):
+        engine = cls()
+        undo = state.get("_undo")
+        engine.__dict__.update(engine._decode({k: v for k, v in state.items() if k != "_undo"}))
+        engine._undo = engine._decode(undo) if undo is not None else None
+        return engine
+
+    @classmethod
+    def from_history(cls, df):
+        """Warms a new engine up on a full history. Returns (engine, indicator frame)."""
+        engine = cls()
+        return engine, engine.update_frame(df)
+
+def save_state(symbol, engine, state_dir=STATE_DIR):
+    os.makedirs(state_dir, exist_ok=True)
+    with open(os.path.join(state_dir, f"{symbol}.json"), "w") as f:
+        json.dump(engine.to_dict(), f)
+
+def load_state(symbol, state_dir=STATE_DIR):
+    """Restores a symbol's engine, or None if nothing was saved."""
+    path = os.path.join(state_dir, f"{symbol}.json")
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return IndicatorEngine.from_dict(json.load(f))
+
+def advance(symbol, df, state_dir=STATE_DIR):
+    """
+    Feeds df's bars into the symbol's saved engine (warming a fresh one up if there is none)
+    and saves the new state. Only bars from the last one seen onwards are processed.
+    Returns those rows with indicators.
+    """
+    engine = load_state(symbol, state_dir) or IndicatorEngine()
+    out = engine.update_frame(df)
+    save_state(symbol, engine, state_dir)
+    return out
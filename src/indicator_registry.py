@@ -0,0 +1,69 @@
+# src/indicator_registry.py
+
+class IndicatorRegistry:
+    """
+    Declarative indicator specs. Each spec names the columns it produces, the columns it
+    reads, and a function computing them from a dict of already available series.
+    compute() runs only the specs needed for the requested columns, each once, so shared
+    intermediates (true range, ATR, SMA 20 ...) are computed a single time.
+    Names starting with '_' are intermediates: computed when needed, never returned.
+    """
+    def __init__(self):
+        self._specs = {} # column -> (outputs, deps, func)
+
+    def register(self, outputs, deps=()):
+        """Decorator. outputs is a column name or a tuple of names (func then returns a tuple)."""
+        outputs = (outputs,) if isinstance(outputs, str) else tuple(outputs)
+
+        def wrap(func):
+            spec = (outputs, tuple(deps), func)
+            for name in outputs:
+                self._specs[name] = spec
+            return func
+        return wrap
+
+    def __contains__(self, name):
+        return name in self._specs
+
+    def columns(self):
+        return [name for name in self._specs if not name.startswith('_')]
+
+    def resolve(self, columns, available=()):
+        """Specs needed for columns, dependencies first. Names in `available` are not recomputed."""
+        order = []
+        seen = set(available)
+
+        def visit(name):
+            if name in seen:
+                return
+            seen.add(name)
+            if name not in self._specs:
+                return # Base input (Close, Volume ...)
+            outputs, deps, func = self._specs[name]
+            for dep in deps:
+                visit(dep)
+            seen.update(outputs)
+            order.append(self._specs[name])
+
+        for name in columns:
+            if name not in self._specs and name not in seen:
+                raise KeyError(f"Unknown indicator: {name}")
+            visit(name)
+        return order
+
+    def compute(self, inputs, columns):
+        """
+        Computes columns (plus whatever they depend on) from inputs, a dict of base series.
+        Returns {name: values} for every computed non-intermediate column.
+        """
+        values = dict(inputs)
+        out = {}
+        for outputs, deps, func in self.resolve(columns, available=inputs):
+            result = func(values)
+            if len(outputs) == 1:
+                result = (result,)
+            for name, value in zip(outputs, result):
+                values[name] = value
+                if not name.startswith('_'):
+                    out[name] = value
+        return out
@@ -1,155 +1,106 @@
 # src/indicators.py
 import pandas as pd
-import ta 
+from src import kernels
+from src.indicator_registry import IndicatorRegistry
+from src.patterns import detect_patterns
 
-def add_indicators(df):
-    """Calculates basic indicators using 'ta' library."""
-    df = df.copy()
-    
-    # RSI
-    df['RSI'] = ta.momentum.rsi(df['Close'], window=14)
-    
-    # EMAs
-    df['EMA_Fast'] = ta.trend.ema_indicator(df['Close'], window=8)
-    df['EMA_Slow'] = ta.trend.ema_indicator(df['Close'], window=21)
-    
-    # MACD
-    macd = ta.trend.MACD(df['Close'])
-    df['MACD'] = macd.macd()
-    
-    # ATR
-    df['ATR'] = ta.volatility.average_true_range(df['High'], df['Low'], df['Close'], window=14)
+# Columns add_indicators() returns by default
+INDICATOR_COLUMNS = ['RSI', 'EMA_Fast', 'EMA_Slow', 'MACD', 'ATR', 'BB_High', 'BB_Low', 'ADX',
+                     'VWAP', 'OBV', 'SuperTrend', 'SuperTrend_Signal', 'Stoch_K']
 
-    # Bollinger Bands
-    bb = ta.volatility.BollingerBands(close=df['Close'], window=20, window_dev=2)
-    df['BB_High'] = bb.bollinger_hband()
-    df['BB_Low'] = bb.bollinger_lband()
+# Inputs of the per-stock AI models (model_train.py trains on these, scanner.py predicts on them)
+FEATURES = ['RSI', 'SMA_20', 'SMA_50', 'Close', 'Volume']
 
-    # ADX
-    adx = ta.trend.ADXIndicator(df['High'], df['Low'], df['Close'], window=14)
-    df['ADX'] = adx.adx()
+# --- Indicator specs (computed lazily, see add_indicators) ---
+# All values are NumPy arrays from src/kernels.py (same results as the 'ta' package).
+INDICATORS = IndicatorRegistry()
 
-    # --- VOLUME & MOMENTUM ---
-    
+@INDICATORS.register('RSI', deps=['Close'])
+def _rsi(v): return kernels.rsi(v['Close'], window=14)
+
+@INDICATORS.register('EMA_Fast', deps=['Close'])
+def _ema_fast(v): return kernels.ema(v['Close'], window=8)
+
+@INDICATORS.register('EMA_Slow', deps=['Close'])
+def _ema_slow(v): return kernels.ema(v['Close'], window=21)
+
+@INDICATORS.register('SMA_20', deps=['Close'])
+def _sma_20(v): return kernels.sma(v['Close'], window=20)
+
+@INDICATORS.register('SMA_50', deps=['Close'])
+def _sma_50(v): return kernels.sma(v['Close'], window=50)
+
+@INDICATORS.register('MACD', deps=['Close'])
+def _macd(v): return kernels.macd(v['Close'])
+
+@INDICATORS.register('_TR', deps=['High', 'Low', 'Close'])
+def _tr(v): return kernels.true_range(v['High'], v['Low'], v['Close'])
+
+@INDICATORS.register('ATR', deps=['High', 'Low', 'Close', '_TR'])
+def _atr(v): return kernels.atr(v['High'], v['Low'], v['Close'], window=14, tr=v['_TR'])
+
+@INDICATORS.register(('BB_High', 'BB_Low'), deps=['Close', 'SMA_20'])
+def _bollinger(v):
+    # Bollinger Bands (20, 2), reusing SMA 20 as the middle band
+    return kernels.bollinger(v['Close'], window=20, window_dev=2, mid=v['SMA_20'])
+
+@INDICATORS.register('ADX', deps=['High', 'Low', 'Close'])
+def _adx(v): return kernels.adx(v['High'], v['Low'], v['Close'], window=14)
+
+# --- VOLUME & MOMENTUM ---
+
+@INDICATORS.register('VWAP', deps=['Close', 'Volume'])
+def _vwap(v):
     # VWAP (Volume Weighted Average Price)
     # Note: Traditional VWAP resets daily. If data is daily timeframe, this is just typical price * vol. 
     # For meaningful VWAP on daily charts, we usually use Rolling VWAP or Anchored VWAP.
     # Here we implement a Rolling VWAP (20 days) for swing/intraday hybrid view.
-    cum_vol = df['Volume'].rolling(window=20).sum()
-    cum_pv = (df['Close'] * df['Volume']).rolling(window=20).sum()
-    df['VWAP'] = cum_pv / cum_vol
-    
-    # OBV (On Balance Volume)
-    df['OBV'] = ta.volume.on_balance_volume(df['Close'], df['Volume'])
-
-    # SuperTrend (Manual Implementation)
-    high = df['High']
-    low = df['Low']
-    close = df['Close']
-    atr = ta.volatility.average_true_range(high, low, close, window=10)
-    multiplier = 3
-    
-    # Basic calculation
-    hl2 = (high + low) / 2
-    final_upperband = hl2 + (multiplier * atr)
-    final_lowerband = hl2 - (multiplier * atr)
-    
-    # Recursive calculation for SuperTrend
-    supertrend = [True] * len(df) # True = Green, False = Red
-    st_values = [0.0] * len(df)
-    
-    for i in range(1, len(df)):
-        if close.iloc[i] > final_upperband.iloc[i-1]:
-            supertrend[i] = True
-        elif close.iloc[i] < final_lowerband.iloc[i-1]:
-            supertrend[i] = False
-        else:
-            supertrend[i] = supertrend[i-1] # Continue trend
-            
-            # Adjustment logic
-            if supertrend[i] == True and final_lowerband.iloc[i] < final_lowerband.iloc[i-1]:
-                final_lowerband.iloc[i] = final_lowerband.iloc[i-1]
-            if supertrend[i] == False and final_upperband.iloc[i] > final_upperband.iloc[i-1]:
-                final_upperband.iloc[i] = final_upperband.iloc[i-1]
-
-        if supertrend[i]:
-            st_values[i] = final_lowerband.iloc[i]
-        else:
-            st_values[i] = final_upperband.iloc[i]
-            
-    df['SuperTrend'] = st_values
-    df['SuperTrend_Signal'] = supertrend # True=Buy Zone, False=Sell Zone
-    
-    # Stochastic
-    stoch = ta.momentum.StochasticOscillator(df['High'], df['Low'], df['Close'], window=14, smooth_window=3)
-    df['Stoch_K'] = stoch.stoch()
+    return kernels.vwap(v['Close'], v['Volume'], window=20)
 
-    return df
+@INDICATORS.register('OBV', deps=['Close', 'Volume'])
+def _obv(v): return kernels.obv(v['Close'], v['Volume'])
 
-def check_candlestick_patterns(df):
-    """Checks for patterns using pure math (No pandas_ta required)."""
-    # We need at least 3 candles to detect complex patterns
-    recent = df.tail(3).copy()
-    if len(recent) < 3: return []
-    
-    patterns_found = []
-    
-    # Candles: 0=DayBeforeYesterday, 1=Yesterday, 2=Today
-    c0 = recent.iloc[0]
-    c1 = recent.iloc[1]
-    c2 = recent.iloc[2]
-    
-    # --- HELPER FUNCTIONS ---
-    def body(c): return abs(c['Close'] - c['Open'])
-    def is_green(c): return c['Close'] > c['Open']
-    def is_red(c): return c['Close'] < c['Open']
-    
-    # --- 2-CANDLE PATTERNS ---
-    
-    # 1. Bullish Engulfing
-    # Yesterday Red, Today Green, Today engulfs Yesterday
-    if is_red(c1) and is_green(c2) and \
-       (c2['Close'] > c1['Open']) and (c2['Open'] < c1['Close']):
-        patterns_found.append("Bullish Engulfing")
-
-    # 2. Bearish Engulfing
-    # Yesterday Green, Today Red, Today engulfs Yesterday
-    if is_green(c1) and is_red(c2) and \
-       (c2['Open'] > c1['Close']) and (c2['Close'] < c1['Open']):
-        patterns_found.append("Bearish Engulfing")
-
-    # --- SINGLE CANDLE PATTERNS ---
-
-    # 3. Hammer (Bullish Reversal)
-    # Long lower wick (2x body), small upper wick
-    lower_wick = min(c2['Close'], c2['Open']) - c2['Low']
-    upper_wick = c2['High'] - max(c2['Close'], c2['Open'])
-    
-    if (lower_wick > 2 * body(c2)) and (upper_wick < body(c2) * 0.5):
-        patterns_found.append("Hammer")
+@INDICATORS.register('_ATR_10', deps=['High', 'Low', 'Close', '_TR'])
+def _atr_10(v): return kernels.atr(v['High'], v['Low'], v['Close'], window=10, tr=v['_TR'])
+
+@INDICATORS.register(('SuperTrend', 'SuperTrend_Signal'), deps=['High', 'Low', 'Close', '_ATR_10'])
+def _supertrend(v):
+    # Signal: True=Buy Zone, False=Sell Zone
+    return kernels.supertrend(v['High'], v['Low'], v['Close'], v['_ATR_10'], multiplier=3)
 
-    # 4. Shooting Star (Bearish Reversal)
-    # Long upper wick (2x body), small lower wick
-    if (upper_wick > 2 * body(c2)) and (lower_wick < body(c2) * 0.5):
-        patterns_found.append("Shooting Star")
+@INDICATORS.register('Stoch_K', deps=['High', 'Low', 'Close'])
+def _stoch_k(v): return kernels.stoch_k(v['High'], v['Low'], v['Close'], window=14)
 
-    # --- 3-CANDLE PATTERNS ---
+def add_indicators(df, columns=None):
+    """
+    Calculates indicators with the NumPy kernels in src/kernels.py.
+    By default adds INDICATOR_COLUMNS. Pass columns to compute only those (plus the
+    columns they depend on, e.g. BB_High brings SMA_20); columns df already has are reused.
+    """
+    df = df.copy()
+    wanted = INDICATOR_COLUMNS if columns is None else columns
+    values = INDICATORS.compute({c: df[c].to_numpy() for c in df.columns}, wanted)
+    for name, value in values.items():
+        if columns is None and name not in INDICATOR_COLUMNS:
+            continue
+        df[name] = value
+    return df
 
-    # 5. Morning Star (Bullish Reversal)
-    # Big Red -> Small Body (Gap Down) -> Big Green (Gap Up)
-    if is_red(c0) and is_green(c2) and \
-       (body(c0) > body(c1) * 2) and \
-       (c2['Close'] > (c0['Open'] + c0['Close'])/2): 
-        patterns_found.append("Morning Star")
+def add_model_features(df):
+    """Adds the AI model features (RSI 14, SMA 20/50) to a copy of df."""
+    return add_indicators(df, ['RSI', 'SMA_20', 'SMA_50'])
 
-    # 6. Evening Star (Bearish Reversal)
-    # Big Green -> Small Body (Gap Up) -> Big Red (Gap Down)
-    if is_green(c0) and is_red(c2) and \
-       (body(c0) > body(c1) * 2) and \
-       (c2['Close'] < (c0['Open'] + c0['Close'])/2):
-        patterns_found.append("Evening Star")
+def check_candlestick_patterns(df):
+    """
+    Patterns on the latest candle, using pure math (No pandas_ta required).
+    The rules live in src/patterns.py; use detect_patterns() there for the whole history.
+    """
+    # We need at least 3 candles to detect complex patterns
+    recent = df.tail(3)
+    if len(recent) < 3: return []
 
-    return patterns_found
+    latest = detect_patterns(recent).iloc[-1]
+    return [name for name in latest.index if latest[name]]
 
 # ... (Keep existing imports and functions) ...
 
@@ -167,7 +118,10 @@ def check_breakout(df, window=20):
     curr_close = df['Close'].iloc[-1]
     curr_vol = df['Volume'].iloc[-1]
     avg_vol = df['Volume'].rolling(window=20).mean().iloc[-1]
-    
+    return classify_breakout(curr_close, curr_vol, past_high, past_low, avg_vol)
+
+def classify_breakout(curr_close, curr_vol, past_high, past_low, avg_vol):
+    """The check_breakout rules on plain values (used by the panel scanner too)."""
     # 3. Check for Bullish Breakout (Price > High AND Volume > Average)
     if curr_close > past_high and curr_vol > avg_vol:
         return "Bullish Breakout 🚀"
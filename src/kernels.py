@@ -0,0 +1,328 @@
+# src/kernels.py
+# Array-level indicator kernels for the hot path (replace the 'ta' package).
+# Every kernel takes 1D arrays (one symbol) or 2D (dates x symbols) arrays and works
+# along the date axis. Results follow ta's conventions: warm-up NaNs for RSI / EMA /
+# SMA / Bollinger / Stochastic, warm-up zeros for ATR / ADX. check_kernels.py holds
+# the parity checks against ta.
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Numba is optional. With it the recursive kernels compile to machine code;
+# without it they run as a plain Python loop over lists (still far faster than .iloc).
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+def _supertrend_loop(close, upper, lower, trend, st):
+    """
+    SuperTrend recursion, written so it works on NumPy arrays (Numba) and on Python lists.
+    upper / lower are adjusted in place, exactly like the original pandas loop.
+    """
+    for i in range(1, len(close)):
+        if close[i] > upper[i - 1]:
+            trend[i] = True
+        elif close[i] < lower[i - 1]:
+            trend[i] = False
+        else:
+            trend[i] = trend[i - 1] # Continue trend
+
+            # Adjustment logic
+            if trend[i] and lower[i] < lower[i - 1]:
+                lower[i] = lower[i - 1]
+            if not trend[i] and upper[i] > upper[i - 1]:
+                upper[i] = upper[i - 1]
+
+        if trend[i]:
+            st[i] = lower[i]
+        else:
+            st[i] = upper[i]
+
+def _linear_loop(x, a, b, start, out):
+    """out[t] = a * out[t-1] + b * x[t] for t > start (out[start] already set). 2D arrays."""
+    for t in range(start + 1, x.shape[0]):
+        for j in range(x.shape[1]):
+            out[t, j] = a * out[t - 1, j] + b * x[t, j]
+
+def _ewm_loop(x, alpha, min_periods, out):
+    """
+    pandas ewm(alpha, adjust=False).mean() per column of a 2D array (also runs on lists of
+    lists). A NaN bar keeps the previous average and still decays its weight, so the next
+    bar is weighted as if the gap were there, and the series carries on after it.
+    """
+    for j in range(len(x[0])):
+        weighted = np.nan
+        old_wt = 1.0
+        nobs = 0
+        for t in range(len(x)):
+            cur = x[t][j]
+            is_obs = cur == cur
+            if is_obs:
+                nobs += 1
+            if weighted == weighted:
+                old_wt *= 1 - alpha
+                if is_obs:
+                    if weighted != cur:
+                        weighted = (old_wt * weighted + alpha * cur) / (old_wt + alpha)
+                    old_wt = 1.0
+            elif is_obs:
+                weighted = cur
+            out[t][j] = weighted if nobs >= min_periods else np.nan
+
+if HAS_NUMBA:
+    _supertrend_compiled = njit(cache=True)(_supertrend_loop)
+    _linear_compiled = njit(cache=True)(_linear_loop)
+    _ewm_compiled = njit(cache=True)(_ewm_loop)
+
+# --- Building blocks ---
+
+def _f64(x):
+    return np.asarray(x, dtype=np.float64)
+
+def shift(x, periods=1):
+    """x moved `periods` bars later along dates, NaN in front."""
+    out = np.full(x.shape, np.nan)
+    out[periods:] = x[:len(x) - periods]
+    return out
+
+def rolling(x, window, func):
+    """Trailing window reduction along dates (func(..., axis=-1)). First window-1 rows are NaN."""
+    out = np.full(x.shape, np.nan)
+    if len(x) >= window:
+        out[window - 1:] = func(sliding_window_view(x, window, axis=0), axis=-1)
+    return out
+
+def linear_recursion(x, a, b, start=0, init=None):
+    """
+    First-order recursion y[t] = a * y[t-1] + b * x[t] for t > start, with y[start] = init
+    (default x[start]). Rows before start are NaN. Covers EMAs and every Wilder smoothing.
+    """
+    x = _f64(x)
+    out = np.full(x.shape, np.nan)
+    if len(x) <= start:
+        return out
+    out[start] = x[start] if init is None else init
+    if HAS_NUMBA:
+        _linear_compiled(x.reshape(len(x), -1), a, b, start, out.reshape(len(x), -1))
+    elif x.ndim == 1:
+        # Plain floats are much faster than NumPy scalars in a Python loop
+        values, y = x.tolist(), float(out[start])
+        result = out.tolist()
+        for t in range(start + 1, len(values)):
+            y = a * y + b * values[t]
+            result[t] = y
+        out = np.array(result, dtype=np.float64)
+    else:
+        for t in range(start + 1, len(x)):
+            out[t] = a * out[t - 1] + b * x[t]
+    return out
+
+def ewm_mean(x, alpha, min_periods=0):
+    """
+    pandas x.ewm(alpha=alpha, min_periods=min_periods, adjust=False).mean(): like
+    linear_recursion, but NaN bars are skipped instead of poisoning the rest of the history.
+    min_periods counts valid bars.
+    """
+    x = _f64(x)
+    out = np.full(x.shape, np.nan)
+    if len(x) == 0:
+        return out
+    if HAS_NUMBA:
+        _ewm_compiled(x.reshape(len(x), -1), alpha, min_periods, out.reshape(len(x), -1))
+    elif x.ndim == 1:
+        # Plain floats are much faster than NumPy scalars in a Python loop
+        result = out.reshape(-1, 1).tolist()
+        _ewm_loop(x.reshape(-1, 1).tolist(), alpha, min_periods, result)
+        out = np.array(result, dtype=np.float64).reshape(x.shape)
+    else:
+        # One date step for all symbols at a time, same steps as _ewm_loop
+        weighted = np.full(x.shape[1], np.nan)
+        old_wt = np.ones(x.shape[1])
+        nobs = np.zeros(x.shape[1], dtype=np.int64)
+        for t in range(len(x)):
+            cur = x[t]
+            is_obs = ~np.isnan(cur)
+            nobs += is_obs
+            has = ~np.isnan(weighted)
+            old_wt = np.where(has, old_wt * (1 - alpha), old_wt)
+            update = has & is_obs
+            with np.errstate(invalid="ignore"):
+                blended = (old_wt * weighted + alpha * cur) / (old_wt + alpha)
+            weighted = np.where(update & (weighted != cur), blended, weighted)
+            old_wt = np.where(update, 1.0, old_wt)
+            weighted = np.where(~has & is_obs, cur, weighted)
+            out[t] = np.where(nobs >= min_periods, weighted, np.nan)
+    return out
+
+def first_valid_sum(x, count):
+    """Per column, the sum of the first `count` non-NaN values (pandas x.dropna()[:count].sum())."""
+    valid = ~np.isnan(x)
+    seen = np.cumsum(valid, axis=0)
+    totals = np.nancumsum(x, axis=0)
+    row = np.where(seen[-1] >= count, np.argmax(seen >= count, axis=0), len(x) - 1)
+    return np.take_along_axis(totals, np.expand_dims(row, 0), axis=0)[0]
+
+def nan_mean(x):
+    """Mean along dates ignoring NaN (pandas Series.mean); NaN if nothing is valid."""
+    valid = ~np.isnan(x)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.nansum(x, axis=0) / valid.sum(axis=0)
+
+# --- Indicators ---
+
+def sma(close, window):
+    return rolling(_f64(close), window, np.mean)
+
+def ema(close, window):
+    """ta.trend.ema_indicator: pandas ewm(span=window, min_periods=window, adjust=False)."""
+    return ewm_mean(close, 2 / (window + 1), min_periods=window)
+
+def macd(close, fast=12, slow=26):
+    """ta.trend.MACD(...).macd(): EMA(fast) - EMA(slow)."""
+    return ema(close, fast) - ema(close, slow)
+
+def rsi(close, window=14):
+    """ta.momentum.rsi: Wilder-smoothed up / down moves (ewm alpha=1/window)."""
+    close = _f64(close)
+    diff = np.zeros_like(close)
+    diff[1:] = close[1:] - close[:-1]
+    alpha = 1 / window
+    up = linear_recursion(np.where(diff > 0, diff, 0.0), 1 - alpha, alpha)
+    dn = linear_recursion(np.where(diff < 0, -diff, 0.0), 1 - alpha, alpha)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = np.where(dn == 0, 100.0, 100 - (100 / (1 + up / dn)))
+    out[:window - 1] = np.nan
+    return out
+
+def true_range(high, low, close):
+    """max(high-low, |high-prev close|, |low-prev close|); bar 0 is high-low."""
+    high, low, close = _f64(high), _f64(low), _f64(close)
+    prev_close = shift(close)
+    tr = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+    if len(tr):
+        tr[0] = high[0] - low[0]
+    return tr
+
+def atr(high, low, close, window=14, tr=None):
+    """
+    ta.volatility.average_true_range: zeros for the first window-1 bars, then the mean of
+    the first window true ranges (NaN bars skipped), then Wilder smoothing. Like ta, a NaN
+    bar after that turns the rest of the series NaN. Pass tr to reuse a true range.
+    """
+    tr = true_range(high, low, close) if tr is None else tr
+    out = np.zeros_like(tr)
+    if len(tr) < window:
+        return out
+    smoothed = linear_recursion(tr, (window - 1) / window, 1 / window,
+                                start=window - 1, init=nan_mean(tr[:window]))
+    out[window - 1:] = smoothed[window - 1:]
+    return out
+
+def adx(high, low, close, window=14):
+    """
+    ta.trend.ADXIndicator(...).adx(): zeros for the first 2 * window - 1 bars. NaN bars are
+    skipped in the starting sums and, as in ta, a NaN bar after that turns the rest NaN.
+    """
+    high, low, close = _f64(high), _f64(low), _f64(close)
+    w = window
+    out = np.zeros_like(close)
+    if len(close) < 2 * w:
+        return out
+    prev_close, prev_high, prev_low = shift(close), shift(high), shift(low)
+    ddm = np.maximum(high, prev_close) - np.minimum(low, prev_close) # NaN on bar 0 and gaps
+    diff_up = high - prev_high
+    diff_down = prev_low - low
+    pos = np.where((diff_up > diff_down) & (diff_up > 0), diff_up, 0.0)
+    neg = np.where((diff_down > diff_up) & (diff_down > 0), diff_down, 0.0)
+    pos[np.isnan(diff_up)] = np.nan
+    neg[np.isnan(diff_down)] = np.nan
+
+    # Smoothed sums: bar w holds the plain sum of the first w valid bars, then x - x/w + new
+    def smooth(x):
+        return linear_recursion(x, 1 - 1 / w, 1.0, start=w, init=first_valid_sum(x, w))
+    trs, dip, din = smooth(ddm), smooth(pos), smooth(neg)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dip = np.where(trs != 0, 100 * (dip / trs), 0.0)
+        din = np.where(trs != 0, 100 * (din / trs), 0.0)
+        dx = np.where(dip + din != 0, 100 * np.abs((dip - din) / (dip + din)), 0.0)
+
+    smoothed = linear_recursion(dx, (w - 1) / w, 1 / w, start=2 * w - 1, init=dx[w:2 * w].mean(axis=0))
+    out[2 * w - 1:] = smoothed[2 * w - 1:]
+    return out
+
+def bollinger(close, window=20, window_dev=2, mid=None):
+    """ta.volatility.BollingerBands: (high band, low band), population std. mid = SMA to reuse."""
+    close = _f64(close)
+    mid = sma(close, window) if mid is None else mid
+    std = rolling(close, window, np.std)
+    return mid + window_dev * std, mid - window_dev * std
+
+def obv(close, volume):
+    """
+    ta.volume.on_balance_volume: an unchanged close counts as up-volume, bar 0 included.
+    Like pandas cumsum, a NaN bar is NaN itself but doesn't stop the running total.
+    """
+    close, volume = _f64(close), _f64(volume)
+    signed = np.where(close < shift(close), -volume, volume)
+    out = np.nancumsum(signed, axis=0)
+    out[np.isnan(signed)] = np.nan
+    return out
+
+def stoch_k(high, low, close, window=14):
+    """ta.momentum.StochasticOscillator(...).stoch() (%K)."""
+    high, low, close = _f64(high), _f64(low), _f64(close)
+    low_min = rolling(low, window, np.min)
+    high_max = rolling(high, window, np.max)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 100 * (close - low_min) / (high_max - low_min)
+
+def vwap(close, volume, window=20):
+    """Rolling VWAP: sum(close * volume) / sum(volume) over the window."""
+    close, volume = _f64(close), _f64(volume)
+    return rolling(close * volume, window, np.sum) / rolling(volume, window, np.sum)
+
+def supertrend(high, low, close, atr, multiplier=3):
+    """
+    SuperTrend over NumPy arrays.
+    Returns (values, signal): float64 band values and bool trend (True = Buy Zone).
+    Bar 0 is (0.0, True), same as the original implementation.
+    """
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    close = np.asarray(close, dtype=np.float64)
+    atr = np.asarray(atr, dtype=np.float64)
+    n = len(close)
+
+    hl2 = (high + low) / 2
+    upper = hl2 + (multiplier * atr)
+    lower = hl2 - (multiplier * atr)
+
+    if close.ndim == 2:
+        return _supertrend_panel(close, upper, lower)
+
+    if HAS_NUMBA:
+        trend = np.ones(n, dtype=np.bool_)
+        st = np.zeros(n, dtype=np.float64)
+        _supertrend_compiled(close, upper, lower, trend, st)
+        return st, trend
+
+    trend = [True] * n
+    st = [0.0] * n
+    _supertrend_loop(close.tolist(), upper.tolist(), lower.tolist(), trend, st)
+    return np.array(st, dtype=np.float64), np.array(trend, dtype=bool)
+
+def _supertrend_panel(close, upper, lower):
+    """The same recursion for (dates x symbols) arrays, one date step for all symbols at a time."""
+    trend = np.ones(close.shape, dtype=bool)
+    st = np.zeros_like(close)
+    for t in range(1, len(close)):
+        up_break = close[t] > upper[t - 1]
+        down_break = close[t] < lower[t - 1]
+        hold = ~up_break & ~down_break
+        trend[t] = np.where(up_break, True, np.where(down_break, False, trend[t - 1]))
+        lower[t] = np.where(hold & trend[t] & (lower[t] < lower[t - 1]), lower[t - 1], lower[t])
+        upper[t] = np.where(hold & ~trend[t] & (upper[t] > upper[t - 1]), upper[t - 1], upper[t])
+        st[t] = np.where(trend[t], lower[t], upper[t])
+    return st, trend
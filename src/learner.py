@@ -1,6 +1,5 @@
 import json
 import pandas as pd
-import yfinance as yf
 from src.config import PAPER_TRADE_FILE
 
 def load_trades():
@@ -1,6 +1,10 @@
-import yfinance as yf
 import pandas as pd
 from src.sectors import get_stocks_by_sector
+from src.providers import get_provider
+from src.indicators import add_indicators
+
+# Columns get_market_condition reads
+MARKET_INDICATORS = ['ADX', 'SMA_20', 'SMA_50']
 
 # Indices to track
 GLOBAL_INDICES = {
@@ -21,28 +25,33 @@ def get_market_condition(df):
         # We need at least 50 candles
         if len(df) < 50: return "UNKNOWN"
         
+        # Only ADX and the two SMAs are needed (reused if df already has them)
+        df = add_indicators(df, MARKET_INDICATORS)
         current = df.iloc[-1]
-        sma_20 = df['Close'].rolling(window=20).mean().iloc[-1]
-        sma_50 = df['Close'].rolling(window=50).mean().iloc[-1]
+        sma_20 = df['SMA_20'].iloc[-1]
+        sma_50 = df['SMA_50'].iloc[-1]
         adx = df['ADX'].iloc[-1]
-        
-        # 1. Check for Strong Trend (ADX > 25)
-        if adx > 25:
-            if current['Close'] > sma_20 > sma_50:
-                return "TRENDING UP 🚀"
-            elif current['Close'] < sma_20 < sma_50:
-                return "TRENDING DOWN 🔻"
-        
-        # 2. Check for Volatility (ATR checks or huge wicks - simplified here)
-        # If ADX is low (< 20), it's sideways
-        if adx < 20:
-            return "SIDEWAYS 💤"
-            
-        return "VOLATILE / CHOPPY ⚠️"
+        return classify_market(current['Close'], sma_20, sma_50, adx)
         
     except Exception as e:
         return "ERROR"
 
+def classify_market(close, sma_20, sma_50, adx):
+    """The get_market_condition rules on plain values (used by the panel scanner too)."""
+    # 1. Check for Strong Trend (ADX > 25)
+    if adx > 25:
+        if close > sma_20 > sma_50:
+            return "TRENDING UP 🚀"
+        elif close < sma_20 < sma_50:
+            return "TRENDING DOWN 🔻"
+    
+    # 2. Check for Volatility (ATR checks or huge wicks - simplified here)
+    # If ADX is low (< 20), it's sideways
+    if adx < 20:
+        return "SIDEWAYS 💤"
+        
+    return "VOLATILE / CHOPPY ⚠️"
+
 def get_global_cues():
     """
     Fetches performance of global/major indices.
@@ -50,7 +59,7 @@ def get_global_cues():
     cues = {}
     try:
         tickers = list(GLOBAL_INDICES.keys())
-        data = yf.download(tickers, period="2d", progress=False)['Close']
+        data = get_provider().download(tickers, period="2d")['Close']
         
         # Handle case where single ticker returns Series instead of DataFrame
         if isinstance(data, pd.Series):
@@ -97,7 +106,7 @@ def analyze_sector_performance():
     }
 
     try:
-        data = yf.download(list(sector_proxies.values()), period="2d", progress=False)['Close']
+        data = get_provider().download(list(sector_proxies.values()), period="2d")['Close']
         
         for sector, symbol in sector_proxies.items():
             if symbol in data.columns:
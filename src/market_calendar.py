@@ -0,0 +1,79 @@
+# src/market_calendar.py
+import os
+from datetime import date, datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+IST = ZoneInfo("Asia/Kolkata")
+
+# NSE equity session times (IST)
+PRE_OPEN_TIME = time(9, 0)
+OPEN_TIME = time(9, 15)
+CLOSE_TIME = time(15, 30)
+# Yahoo takes a few minutes after the close to publish the final daily bar
+SETTLE_DELAY = timedelta(minutes=15)
+
+# Session states
+HOLIDAY = "HOLIDAY"        # Weekend or exchange holiday
+PRE_OPEN = "PRE_OPEN"      # Trading day, before the bell
+OPEN = "OPEN"              # Market hours
+POST_CLOSE = "POST_CLOSE"  # Trading day, after the close
+
+# NSE trading holidays (weekday closures only). Update yearly from the NSE holiday circular.
+# Extra dates can be added without a code change: NSE_EXTRA_HOLIDAYS="2026-12-31,2027-01-26"
+NSE_HOLIDAYS = {
+    # 2025
+    date(2025, 2, 26), date(2025, 3, 14), date(2025, 3, 31), date(2025, 4, 10),
+    date(2025, 4, 14), date(2025, 4, 18), date(2025, 5, 1), date(2025, 8, 15),
+    date(2025, 8, 27), date(2025, 10, 2), date(2025, 10, 21), date(2025, 10, 22),
+    date(2025, 11, 5), date(2025, 12, 25),
+    # 2026
+    date(2026, 1, 26), date(2026, 3, 3), date(2026, 3, 26), date(2026, 3, 31),
+    date(2026, 4, 3), date(2026, 4, 14), date(2026, 5, 1), date(2026, 5, 28),
+    date(2026, 6, 26), date(2026, 9, 14), date(2026, 10, 2), date(2026, 10, 20),
+    date(2026, 11, 10), date(2026, 11, 24), date(2026, 12, 25),
+}
+for _d in filter(None, os.getenv("NSE_EXTRA_HOLIDAYS", "").split(",")):
+    NSE_HOLIDAYS.add(date.fromisoformat(_d.strip()))
+
+def now_ist():
+    return datetime.now(IST)
+
+def is_trading_day(day):
+    return day.weekday() < 5 and day not in NSE_HOLIDAYS
+
+def session_state(now=None):
+    """Where we are in the NSE trading day: HOLIDAY, PRE_OPEN, OPEN or POST_CLOSE."""
+    now = now_ist() if now is None else now.astimezone(IST)
+    if not is_trading_day(now.date()):
+        return HOLIDAY
+    if now.time() < OPEN_TIME:
+        return PRE_OPEN
+    if now.time() < CLOSE_TIME:
+        return OPEN
+    return POST_CLOSE
+
+def previous_trading_day(day):
+    day -= timedelta(days=1)
+    while not is_trading_day(day):
+        day -= timedelta(days=1)
+    return day
+
+def last_completed_session(now=None):
+    """Date of the most recent session that has already closed."""
+    now = now_ist() if now is None else now.astimezone(IST)
+    today = now.date()
+    if is_trading_day(today) and now.time() >= CLOSE_TIME:
+        return today
+    return previous_trading_day(today)
+
+def session_close(day):
+    """Close of a session as an aware IST datetime."""
+    return datetime.combine(day, CLOSE_TIME, tzinfo=IST)
+
+def is_session_final(last_bar_day, fetched_at, now=None):
+    """
+    True if a daily series ending on last_bar_day, fetched at fetched_at, already holds
+    the final bar of the latest completed session (so nothing can have changed since).
+    """
+    session = last_completed_session(now)
+    return last_bar_day >= session and fetched_at >= session_close(session) + SETTLE_DELAY
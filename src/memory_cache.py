@@ -0,0 +1,87 @@
+# src/memory_cache.py
+import threading
+import time
+from collections import OrderedDict
+
+class MemoryCache:
+    """
+    In-process LRU cache for DataFrames with a byte budget and per-entry TTL.
+    Entries are stored as-is, so callers must not mutate what they get back
+    (data_loader hands out copies of slices for that reason).
+    """
+    def __init__(self, max_bytes, default_ttl=900):
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._entries = OrderedDict() # key -> (value, size, expires_at)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def size_of(df):
+        return int(df.memory_usage(index=True, deep=True).sum())
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, size, expires_at = entry
+            if time.time() >= expires_at:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key) # Most recently used
+            self.hits += 1
+            return value
+
+    def put(self, key, df, ttl=None):
+        ttl = self.default_ttl if ttl is None else ttl
+        size = self.size_of(df)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            # Bigger than the whole budget (or already expired) -> don't bother
+            if size > self.max_bytes or ttl <= 0:
+                return
+
+            self._entries[key] = (df, size, time.time() + ttl)
+            self._bytes += size
+
+            # Evict least recently used until we're back under budget
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate(self, key=None):
+        """Drops one entry, or everything if no key is given."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self._bytes = 0
+            elif key in self._entries:
+                self._remove(key)
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
@@ -0,0 +1,86 @@
+# src/model_registry.py
+import os
+import threading
+from collections import OrderedDict
+import joblib
+from src.config import MODEL_PATH, MODEL_CACHE_SIZE
+
+def model_path(symbol, model_dir=None):
+    clean_symbol = symbol.replace('.NS', '')
+    return f"{model_dir or MODEL_PATH}/{clean_symbol}_model.pkl"
+
+class ModelRegistry:
+    """
+    Loaded per-symbol models, so a scan unpickles each model once instead of on every call.
+    LRU bounded to max_models. Every get() stats the file and reloads when its mtime or
+    size changed (i.e. the model was retrained). Each process (scan worker) holds its own
+    copy: sklearn copies tree arrays into private memory on unpickling, so they can't be
+    shared through a memory map.
+    """
+    def __init__(self, max_models=128, model_dir=None):
+        self.max_models = max_models
+        self.model_dir = model_dir
+        self._models = OrderedDict() # path -> (model, (mtime_ns, size))
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.loads = 0
+        self.reloads = 0
+        self.evictions = 0
+
+    def get(self, symbol):
+        """The symbol's model, or None if it has no model file."""
+        path = model_path(symbol, self.model_dir)
+        try:
+            st = os.stat(path)
+        except OSError:
+            self.invalidate(path)
+            return None
+        version = (st.st_mtime_ns, st.st_size)
+
+        with self._lock:
+            entry = self._models.get(path)
+            if entry is not None and entry[1] == version:
+                self._models.move_to_end(path)
+                self.hits += 1
+                return entry[0]
+
+        # Load outside the lock; two threads racing on a cold model just load it twice
+        model = joblib.load(path)
+        with self._lock:
+            if path in self._models:
+                self.reloads += 1
+            else:
+                self.loads += 1
+            self._models[path] = (model, version)
+            self._models.move_to_end(path)
+            while len(self._models) > self.max_models:
+                self._models.popitem(last=False)
+                self.evictions += 1
+        return model
+
+    def invalidate(self, path=None):
+        """Drops one model file (path), or everything."""
+        with self._lock:
+            if path is None:
+                self._models.clear()
+            else:
+                self._models.pop(path, None)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "models": len(self._models),
+                "max_models": self.max_models,
+                "hits": self.hits,
+                "loads": self.loads,
+                "reloads": self.reloads,
+                "evictions": self.evictions,
+            }
+
+MODELS = ModelRegistry(max_models=MODEL_CACHE_SIZE)
+
+def get_model(symbol):
+    return MODELS.get(symbol)
+
+def get_model_stats():
+    return MODELS.stats()
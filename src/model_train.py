@@ -2,55 +2,253 @@
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score
+import argparse
+import hashlib
+import json
+import os
+import multiprocessing
 import joblib
 import pandas as pd
-import ta
 import time
-from src.data_loader import fetch_data
-from src.config import MODEL_PATH
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from src.data_loader import fetch_data, fetch_data_many
+from src.feature_cache import get_model_features
+from src.indicators import FEATURES
+from src.market_calendar import last_completed_session
+from src.config import MODEL_PATH, TRAIN_WORKERS, TRAIN_BATCH_SIZE
 from src.utils import ensure_directories_exist
 from src.sectors import get_sector_list, get_stocks_by_sector
 
-def train_model(symbol):
+CHECKPOINT_FILE = "train_checkpoint.json" # In MODEL_PATH, removed once a run finishes
+MODEL_PARAMS = {"n_estimators": 100, "random_state": 42}
+
+# --- Fingerprints: what each saved model was trained on, so unchanged models aren't refit ---
+def model_file(symbol):
+    return f"{MODEL_PATH}/{symbol.replace('.NS', '')}_model.pkl"
+
+def fingerprint_file(symbol):
+    return f"{MODEL_PATH}/{symbol.replace('.NS', '')}_model.json"
+
+def data_fingerprint(df):
+    """Last bar, row count and a hash of the bars, plus the feature spec and model parameters."""
+    content = hashlib.sha1(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes()).hexdigest()
+    return {
+        "last_bar": df.index[-1].isoformat(),
+        "rows": len(df),
+        "hash": content,
+        "features": FEATURES,
+        "params": MODEL_PARAMS,
+    }
+
+def load_fingerprint(symbol):
+    try:
+        with open(fingerprint_file(symbol)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def is_up_to_date(symbol, fingerprint):
+    """True if the saved model was trained on exactly this data with the current spec."""
+    return os.path.exists(model_file(symbol)) and load_fingerprint(symbol) == fingerprint
+
+def train_model(symbol, df=None, n_jobs=None, force=False):
+    """
+    Trains and saves one symbol's model. n_jobs = cores for the forest fit (None = 1).
+    Skips the fit when the saved model's fingerprint matches df, unless force=True.
+    Returns {"symbol", "status": trained / up_to_date / skipped / failed, "seconds", "rows", "error"}.
+    """
     print(f"🧠 Training AI Brain for {symbol}...")
+    start = time.perf_counter()
+    result = {"symbol": symbol, "status": "failed", "seconds": 0.0, "rows": 0, "error": None}
     try:
         # 1. Fetch Data (2 years is good for pattern recognition)
-        df = fetch_data(symbol, period="2y")
+        if df is None:
+            df = fetch_data(symbol, period="2y")
         
         # Need enough data to calculate indicators (at least ~50-60 rows)
         if df.empty or len(df) < 60: 
             print(f"   ⚠️ Not enough data for {symbol}. Skipping.")
-            return
+            result["status"] = "skipped"
+            result["error"] = f"{len(df)} bars"
+            return result
 
-        # 2. Indicators (Must match scanner.py exactly)
-        df['RSI'] = ta.momentum.rsi(df['Close'], window=14)
-        df['SMA_20'] = ta.trend.sma_indicator(df['Close'], window=20)
-        df['SMA_50'] = ta.trend.sma_indicator(df['Close'], window=50)
+        # Nothing changed since the last fit -> keep the saved model
+        fingerprint = data_fingerprint(df)
+        if not force and is_up_to_date(symbol, fingerprint):
+            print(f"   💤 {symbol} is up to date")
+            result["status"] = "up_to_date"
+            return result
+
+        # 2. Indicators (same features the scanner predicts on, memoized per last bar)
+        df = get_model_features(symbol, df)
         
         # 3. Target: 1 if Price rises tomorrow, else 0
         df['Target'] = (df['Close'].shift(-1) > df['Close']).astype(int)
         
         df.dropna(inplace=True)
 
-        features = ['RSI', 'SMA_20', 'SMA_50', 'Close', 'Volume']
-        X = df[features]
+        X = df[FEATURES]
         y = df['Target']
 
         # 4. Train
-        model = RandomForestClassifier(n_estimators=100, random_state=42)
+        model = RandomForestClassifier(**MODEL_PARAMS, n_jobs=n_jobs)
         model.fit(X, y)
+        model.n_jobs = None # Same trees either way; the scanner predicts single rows, threads only slow it down
 
         # 5. Save
         ensure_directories_exist()
         clean_symbol = symbol.replace('.NS', '')
-        save_path = f"{MODEL_PATH}/{clean_symbol}_model.pkl"
-        joblib.dump(model, save_path)
+        joblib.dump(model, model_file(symbol))
+        # Fingerprint last: a crash in between leaves a stale fingerprint -> refit next time
+        with open(fingerprint_file(symbol), "w") as f:
+            json.dump(fingerprint, f, indent=2)
         print(f"   ✅ Saved {clean_symbol}")
+        result["status"] = "trained"
+        result["rows"] = len(X)
         
     except Exception as e:
         print(f"   ❌ Failed {symbol}: {e}")
+        result["error"] = str(e)
+    finally:
+        result["seconds"] = round(time.perf_counter() - start, 3)
+    return result
+
+def _train_job(job):
+    """Worker entry point: job = (symbol, df, n_jobs, force)."""
+    return train_model(*job)
+
+# --- Checkpoint: results of the current run, so a crashed run resumes where it stopped ---
+# A checkpoint belongs to one run: the same symbol list on the same data session. Anything
+# else (a different universe, new bars since) starts a new run. It is removed as soon as
+# every symbol has a result, failures included, so a symbol that keeps failing doesn't
+# pin later runs to old results.
+def checkpoint_path():
+    return os.path.join(MODEL_PATH, CHECKPOINT_FILE)
+
+def run_id(symbols):
+    return {"session": last_completed_session().isoformat(), "symbols": list(symbols)}
+
+def load_checkpoint(symbols):
+    """Results saved by an unfinished run of exactly this run, else {}."""
+    try:
+        with open(checkpoint_path()) as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(checkpoint, dict) or checkpoint.get("run") != run_id(symbols):
+        return {}
+    return checkpoint.get("results", {})
+
+def save_checkpoint(symbols, results):
+    os.makedirs(MODEL_PATH, exist_ok=True)
+    tmp = checkpoint_path() + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump({"run": run_id(symbols), "results": results}, f, indent=2)
+    os.replace(tmp, checkpoint_path()) # Atomic, a crash mid-write keeps the old checkpoint
+
+def clear_checkpoint():
+    if os.path.exists(checkpoint_path()):
+        os.remove(checkpoint_path())
+
+def _init_train_worker(model_path):
+    """Pool initializer: workers start fresh, so pass on a MODEL_PATH changed at runtime."""
+    global MODEL_PATH
+    MODEL_PATH = model_path
+
+def train_many(symbols, workers=1, n_jobs=None, batch_size=TRAIN_BATCH_SIZE, resume=True, force=False):
+    """
+    Trains every symbol and returns {symbol: train_model() result}.
+    1. Symbols done in the checkpoint of an unfinished run are skipped (resume); failed ones are retried
+    2. Data is prefetched batch_size symbols at a time on a background thread, so the next
+       batch downloads while the current one trains
+    3. workers > 1 fits models across a process pool, otherwise serially (n_jobs cores per forest)
+    4. Models whose training data hasn't changed since their last fit are kept (force=True refits all)
+    The checkpoint is written after every symbol and removed once every symbol has a result.
+    """
+    symbols = list(symbols)
+    results = load_checkpoint(symbols) if resume else {}
+    results = {s: r for s, r in results.items() if r["status"] != "failed"}
+    todo = [s for s in symbols if s not in results]
+    if results:
+        print(f"♻️ Resuming: {len(results)} already done, {len(todo)} to go")
+
+    pool = None
+    if workers > 1:
+        try:
+            # forkserver, not fork: the prefetch thread may hold data-layer locks at fork time
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+            pool = ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                       initializer=_init_train_worker, initargs=(MODEL_PATH,))
+        except OSError as e:
+            print(f"   ⚠️ Process pool unavailable ({e}), training serially")
+
+    def record(result):
+        results[result["symbol"]] = result
+        save_checkpoint(symbols, results)
+        print(f"[{len(results)}/{len(symbols)}] {result['symbol']}: {result['status']} ({result['seconds']:.1f}s)")
+
+    batches = [todo[i:i + batch_size] for i in range(0, len(todo), batch_size)]
+    prefetcher = ThreadPoolExecutor(max_workers=1)
+    try:
+        pending = []
+        next_data = prefetcher.submit(fetch_data_many, batches[0], period="2y") if batches else None
+        for k, batch in enumerate(batches):
+            data = next_data.result()
+            if k + 1 < len(batches):
+                next_data = prefetcher.submit(fetch_data_many, batches[k + 1], period="2y")
+            if pool is None:
+                for symbol in batch:
+                    record(train_model(symbol, data[symbol], n_jobs, force))
+                continue
+            # Collect what finished during the download, then queue this batch
+            for future in [f for f in pending if f.done()]:
+                pending.remove(future)
+                record(future.result())
+            pending += [pool.submit(_train_job, (symbol, data[symbol], n_jobs, force)) for symbol in batch]
+        for future in as_completed(pending):
+            record(future.result())
+    except BrokenProcessPool as e:
+        print(f"   ❌ Training pool died ({e}). Rerun to resume from the checkpoint.")
+        raise
+    finally:
+        prefetcher.shutdown(wait=True, cancel_futures=True)
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    # Every symbol has a result: the run is complete, the next one starts fresh
+    clear_checkpoint()
+    return results
+
+def print_summary(results, elapsed):
+    by_status = {}
+    for r in results.values():
+        by_status.setdefault(r["status"], []).append(r)
+    trained = by_status.get("trained", [])
+    fit_time = sum(r["seconds"] for r in results.values())
+
+    print(f"\n📊 Training summary ({elapsed:.1f}s wall, {fit_time:.1f}s of training)")
+    for status in ("trained", "up_to_date", "skipped", "failed"):
+        print(f"   {status:<8} {len(by_status.get(status, [])):>5}")
+    if trained:
+        slowest = sorted(trained, key=lambda r: r["seconds"], reverse=True)[:5]
+        mean = sum(r["seconds"] for r in trained) / len(trained)
+        print(f"   ⏱️ mean {mean:.2f}s/symbol, slowest: "
+              + ", ".join(f"{r['symbol']} {r['seconds']:.1f}s" for r in slowest))
+    for r in by_status.get("skipped", []) + by_status.get("failed", []):
+        print(f"   {'⚠️' if r['status'] == 'skipped' else '❌'} {r['symbol']}: {r['error']}")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train the per-stock AI models for every sector")
+    parser.add_argument("--workers", type=int, default=TRAIN_WORKERS, help="training processes (default TRAIN_WORKERS)")
+    parser.add_argument("--n-jobs", type=int, help="cores per forest fit (default: all cores when --workers 1, else 1)")
+    parser.add_argument("--batch-size", type=int, default=TRAIN_BATCH_SIZE, help="symbols per prefetch batch")
+    parser.add_argument("--restart", action="store_true", help="ignore the checkpoint of an unfinished run")
+    parser.add_argument("--force", action="store_true", help="refit every model, even if its data is unchanged")
+    args = parser.parse_args()
+    n_jobs = args.n_jobs if args.n_jobs is not None else (-1 if args.workers <= 1 else None)
+
     print("🚀 Starting Mass Training for ALL Sectors...")
     
     # Get every single stock from your new sector map
@@ -60,14 +258,15 @@ if __name__ == "__main__":
         stocks = get_stocks_by_sector(sector)
         all_stocks.extend(stocks)
     
-    # Remove duplicates (some stocks might be in multiple lists)
-    unique_stocks = list(set(all_stocks))
-    
-    print(f"📋 Found {len(unique_stocks)} unique stocks to train.")
+    # Remove duplicates (some stocks might be in multiple lists); sorted so resumed runs keep the order
+    unique_stocks = sorted(set(all_stocks))
     
-    for i, stock in enumerate(unique_stocks):
-        print(f"[{i+1}/{len(unique_stocks)}]", end=" ")
-        train_model(stock)
-        time.sleep(1) # Be polite to the API
+    print(f"📋 Found {len(unique_stocks)} unique stocks to train ({args.workers} workers).")
+
+    # No sleep between symbols: downloads are batched and rate limited in the data layer
+    start = time.perf_counter()
+    results = train_many(unique_stocks, workers=args.workers, n_jobs=n_jobs,
+                         batch_size=args.batch_size, resume=not args.restart, force=args.force)
+    print_summary(results, time.perf_counter() - start)
         
-    print("🏁 All Brains Trained!")
\ No newline at end of file
+    print("🏁 All Brains Trained!")
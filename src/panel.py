@@ -0,0 +1,158 @@
+# src/panel.py
+import json
+import os
+import numpy as np
+import pandas as pd
+from src.data_loader import fetch_data_many
+from src.sectors import get_stocks_by_sector
+
+PANEL_DIR = "data/panel"
+FIELDS = ["Open", "High", "Low", "Close", "Volume"]
+
+class Panel:
+    """
+    Read-only OHLCV panel for the whole universe, backed by a NumPy memmap.
+    data[field] is a float32 (symbols x dates) array on a shared trading-date axis.
+    Missing bars (not listed yet / suspended) are NaN.
+    Several processes opening the same panel share one copy through the page cache.
+    path / version (its build time) are set when the panel was opened with load_panel().
+    """
+    def __init__(self, data, symbols, dates, path=None, version=None):
+        self.data = data
+        self.symbols = symbols
+        self.dates = dates
+        self.path = path
+        self.version = version
+        self._index = {s: i for i, s in enumerate(symbols)}
+
+    def __contains__(self, symbol):
+        return symbol in self._index
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def index_of(self, symbol):
+        return self._index[symbol]
+
+    def field(self, name):
+        """(symbols x dates) view of one field. No copy."""
+        return self.data[FIELDS.index(name)]
+
+    @property
+    def close(self): return self.field("Close")
+
+    def row(self, symbol):
+        """(fields x dates) view of one symbol. No copy."""
+        return self.data[:, self._index[symbol], :]
+
+    def frame(self, symbol):
+        """
+        DataFrame for one symbol, laid out like fetch_data() output.
+        The frame wraps the memmap directly unless NaN rows have to be dropped.
+        """
+        block = self.row(symbol)
+        df = pd.DataFrame(block.T, index=self.dates, columns=FIELDS, copy=False)
+        if np.isnan(block[FIELDS.index("Close")]).any():
+            df = df.dropna(how="all")
+        return df
+
+    def subset(self, symbols):
+        """In-memory panel holding only `symbols` (a copy, on the same date axis)."""
+        data = np.ascontiguousarray(self.data[:, [self._index[s] for s in symbols], :])
+        return Panel(data, list(symbols), self.dates)
+
+    @classmethod
+    def from_frames(cls, frames, dtype=np.float64):
+        """In-memory panel from {symbol: OHLCV DataFrame} (empty frames are left out)."""
+        symbols, dates = align_frames(frames)
+        data = np.full((len(FIELDS), len(symbols), len(dates)), np.nan, dtype=dtype)
+        fill_panel(data, frames, symbols, dates)
+        return cls(data, symbols, dates)
+
+def align_frames(frames):
+    """Symbols with data and the shared trading-date axis (union of every symbol's dates)."""
+    symbols = [s for s, df in frames.items() if not df.empty]
+    if not symbols:
+        return [], pd.DatetimeIndex([], name="Date")
+    dates = frames[symbols[0]].index
+    for s in symbols[1:]:
+        dates = dates.union(frames[s].index)
+    return symbols, dates
+
+def fill_panel(data, frames, symbols, dates):
+    """Writes each symbol's bars into a (fields x symbols x dates) array. Gaps stay as they are (NaN)."""
+    for i, symbol in enumerate(symbols):
+        aligned = frames[symbol].reindex(dates)
+        for f, field in enumerate(FIELDS):
+            data[f, i, :] = aligned[field].to_numpy(dtype=data.dtype)
+
+def build_panel(symbols=None, period="1y", panel_dir=PANEL_DIR):
+    """Builds the memmap panel from the data_loader cache (downloading any misses)."""
+    if symbols is None:
+        symbols = sorted(get_stocks_by_sector("All"))
+    frames = fetch_data_many(symbols, period=period)
+    symbols, dates = align_frames(frames)
+    if not symbols:
+        raise ValueError("No data to build a panel from")
+
+    # Every build writes its own data file; meta.json names the one that goes with it.
+    # Replacing meta.json is then the single atomic swap, so readers never pair new data
+    # with old symbols / dates.
+    built_at = pd.Timestamp.now()
+    data_name = f"ohlcv-{built_at.strftime('%Y%m%dT%H%M%S%f')}.npy"
+    os.makedirs(panel_dir, exist_ok=True)
+    data = np.lib.format.open_memmap(os.path.join(panel_dir, data_name), mode="w+", dtype=np.float32,
+                                     shape=(len(FIELDS), len(symbols), len(dates)))
+    data[:] = np.nan
+    fill_panel(data, frames, symbols, dates)
+    data.flush()
+    del data
+
+    meta = {
+        "data": data_name,
+        "symbols": symbols,
+        "dates": [d.isoformat() for d in dates],
+        "fields": FIELDS,
+        "period": period,
+        "built_at": built_at.isoformat(),
+    }
+    with open(os.path.join(panel_dir, "meta.json.tmp"), "w") as f:
+        json.dump(meta, f)
+    os.replace(os.path.join(panel_dir, "meta.json.tmp"), os.path.join(panel_dir, "meta.json"))
+    remove_old_data(panel_dir, keep=data_name)
+    print(f"📊 Panel built: {len(symbols)} symbols x {len(dates)} dates")
+    return load_panel(panel_dir)
+
+def remove_old_data(panel_dir, keep):
+    """
+    Deletes data files of earlier builds. Panels already open keep working (the memmap
+    holds the file open); a reader that just picked up the old meta.json retries in load_panel.
+    """
+    for name in os.listdir(panel_dir):
+        if name.startswith("ohlcv") and name.endswith(".npy") and name != keep:
+            try:
+                os.remove(os.path.join(panel_dir, name))
+            except OSError:
+                pass
+
+def load_panel(panel_dir=PANEL_DIR, retries=3):
+    """Opens an existing panel read-only. Returns None if it hasn't been built."""
+    meta_path = os.path.join(panel_dir, "meta.json")
+    for attempt in range(retries):
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path) as f:
+            meta = json.load(f)
+        data_path = os.path.join(panel_dir, meta.get("data", "ohlcv.npy"))
+        try:
+            data = np.load(data_path, mmap_mode="r")
+        except FileNotFoundError:
+            continue # Rebuilt between reading meta and opening its data: read meta again
+        if data.shape != (len(FIELDS), len(meta["symbols"]), len(meta["dates"])):
+            raise ValueError(f"{data_path} doesn't match {meta_path}")
+        dates = pd.DatetimeIndex(pd.to_datetime(meta["dates"]), name="Date")
+        return Panel(data, meta["symbols"], dates, path=panel_dir, version=meta["built_at"])
+    return None
+
+if __name__ == "__main__":
+    build_panel()
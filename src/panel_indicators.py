@@ -0,0 +1,130 @@
+# src/panel_indicators.py
+# Cross-sectional version of indicators.add_indicators: every series is a 2D
+# (dates x symbols) array and each indicator is computed for the whole universe at once.
+import numpy as np
+from src import kernels
+from src.indicator_registry import IndicatorRegistry
+
+# Same columns add_indicators() produces, plus the extra series the scanner
+# needs for get_market_condition / check_breakout
+COLUMNS = ['RSI', 'EMA_Fast', 'EMA_Slow', 'MACD', 'ATR', 'BB_High', 'BB_Low', 'ADX',
+           'VWAP', 'OBV', 'SuperTrend', 'SuperTrend_Signal', 'Stoch_K']
+SCAN_COLUMNS = ['SMA_20', 'SMA_50', 'Range_High', 'Range_Low', 'Volume_Avg']
+
+# ta's ADX needs at least 2 * window bars; add_indicators raises below that
+MIN_BARS = 28
+
+# --- Layout helpers ---
+
+def compact_order(valid):
+    """Row order that moves each symbol's valid bars to the top, keeping their date order."""
+    return np.argsort(~valid, axis=0, kind="stable")
+
+def compact(values, valid, order):
+    """
+    Left-aligns each symbol's valid bars: column j's k valid values go to rows 0..k-1,
+    padding (NaN) after. Every symbol then starts at row 0, so warm-up periods line up
+    exactly like a per-symbol dropna() + add_indicators().
+    """
+    out = np.take_along_axis(values, order, axis=0)
+    out[~np.take_along_axis(valid, order, axis=0)] = np.nan
+    return out
+
+def expand(values, valid, order):
+    """Inverse of compact(): puts values back on the shared date axis, NaN where a symbol had no bar."""
+    out = np.full(values.shape, np.nan)
+    np.put_along_axis(out, order, values, axis=0)
+    out[~valid] = np.nan
+    return out
+
+def latest(values, close):
+    """Each symbol's value at its last bar (NaN for symbols without data)."""
+    valid = ~np.isnan(close)
+    last = len(close) - 1 - np.argmax(valid[::-1], axis=0)
+    out = values[last, np.arange(close.shape[1])].astype(np.float64)
+    out[~valid.any(axis=0)] = np.nan
+    return out
+
+# --- Indicator specs (same names as indicators.INDICATORS, kernels from src/kernels.py) ---
+# Inputs are compacted, so bar t = row t for every symbol.
+PANEL_INDICATORS = IndicatorRegistry()
+
+@PANEL_INDICATORS.register('RSI', deps=['Close'])
+def _rsi(v): return kernels.rsi(v['Close'], 14)
+
+@PANEL_INDICATORS.register('EMA_Fast', deps=['Close'])
+def _ema_fast(v): return kernels.ema(v['Close'], 8)
+
+@PANEL_INDICATORS.register('EMA_Slow', deps=['Close'])
+def _ema_slow(v): return kernels.ema(v['Close'], 21)
+
+@PANEL_INDICATORS.register('MACD', deps=['Close'])
+def _macd(v): return kernels.macd(v['Close'])
+
+@PANEL_INDICATORS.register('_TR', deps=['High', 'Low', 'Close'])
+def _tr(v): return kernels.true_range(v['High'], v['Low'], v['Close'])
+
+@PANEL_INDICATORS.register('ATR', deps=['High', 'Low', 'Close', '_TR'])
+def _atr(v): return kernels.atr(v['High'], v['Low'], v['Close'], 14, tr=v['_TR'])
+
+@PANEL_INDICATORS.register('_ATR_10', deps=['High', 'Low', 'Close', '_TR'])
+def _atr_10(v): return kernels.atr(v['High'], v['Low'], v['Close'], 10, tr=v['_TR'])
+
+@PANEL_INDICATORS.register('SMA_20', deps=['Close'])
+def _sma_20(v): return kernels.sma(v['Close'], 20)
+
+@PANEL_INDICATORS.register('SMA_50', deps=['Close'])
+def _sma_50(v): return kernels.sma(v['Close'], 50)
+
+@PANEL_INDICATORS.register(('BB_High', 'BB_Low'), deps=['Close', 'SMA_20'])
+def _bollinger(v): return kernels.bollinger(v['Close'], 20, 2, mid=v['SMA_20'])
+
+@PANEL_INDICATORS.register('ADX', deps=['High', 'Low', 'Close'])
+def _adx(v): return kernels.adx(v['High'], v['Low'], v['Close'], 14)
+
+@PANEL_INDICATORS.register('VWAP', deps=['Close', 'Volume'])
+def _vwap(v): return kernels.vwap(v['Close'], v['Volume'], 20)
+
+@PANEL_INDICATORS.register('OBV', deps=['Close', 'Volume'])
+def _obv(v): return kernels.obv(v['Close'], v['Volume'])
+
+@PANEL_INDICATORS.register(('SuperTrend', 'SuperTrend_Signal'), deps=['High', 'Low', 'Close', '_ATR_10'])
+def _supertrend(v):
+    st, trend = kernels.supertrend(v['High'], v['Low'], v['Close'], v['_ATR_10'], multiplier=3)
+    return st, trend.astype(np.float64)
+
+@PANEL_INDICATORS.register('Stoch_K', deps=['High', 'Low', 'Close'])
+def _stoch_k(v): return kernels.stoch_k(v['High'], v['Low'], v['Close'], 14)
+
+# Inputs for get_market_condition / check_breakout
+@PANEL_INDICATORS.register('Range_High', deps=['High'])
+def _range_high(v): return kernels.shift(kernels.rolling(v['High'], 20, np.max))
+
+@PANEL_INDICATORS.register('Range_Low', deps=['Low'])
+def _range_low(v): return kernels.shift(kernels.rolling(v['Low'], 20, np.min))
+
+@PANEL_INDICATORS.register('Volume_Avg', deps=['Volume'])
+def _volume_avg(v): return kernels.rolling(v['Volume'], 20, np.mean)
+
+# --- Public API ---
+
+def compute_indicators(open_, high, low, close, volume, columns=None):
+    """
+    add_indicators() for a whole universe at once.
+    Inputs are (dates x symbols) arrays on a shared date axis, NaN where a symbol has no bar
+    (not listed yet, suspended, holiday). Returns {column: (dates x symbols) float64 array},
+    NaN at those same positions. SuperTrend_Signal is 1.0 / 0.0.
+    columns picks what to compute (plus dependencies); default is COLUMNS + SCAN_COLUMNS.
+    """
+    valid = ~np.isnan(np.asarray(close, dtype=np.float64))
+    order = compact_order(valid)
+    inputs = {name: compact(np.asarray(a, dtype=np.float64), valid, order)
+              for name, a in zip(("High", "Low", "Close", "Volume"), (high, low, close, volume))}
+
+    out = PANEL_INDICATORS.compute(inputs, COLUMNS + SCAN_COLUMNS if columns is None else columns)
+    return {name: expand(values, valid, order) for name, values in out.items()}
+
+def panel_indicators(panel, columns=None):
+    """compute_indicators() straight from a src.panel.Panel (no per-symbol frames)."""
+    fields = [panel.field(name).T for name in ("Open", "High", "Low", "Close", "Volume")]
+    return compute_indicators(*fields, columns=columns)
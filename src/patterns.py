@@ -0,0 +1,110 @@
+# src/patterns.py
+# Vectorized candlestick patterns: every rule is evaluated over the whole history at once.
+import numpy as np
+import pandas as pd
+
+# name -> rule(candles) returning a bool array (one value per bar). Order = report order.
+PATTERNS = {}
+
+def pattern(name):
+    """Registers a pattern rule. New patterns only need a function decorated with this."""
+    def wrap(func):
+        PATTERNS[name] = func
+        return func
+    return wrap
+
+class Candles:
+    """
+    OHLC arrays plus helpers for the rules. ago(x, n) is x shifted n bars back (NaN before
+    the first bar, so any rule looking further back than the history is simply False).
+    """
+    def __init__(self, df):
+        self.open = df['Open'].to_numpy(dtype=np.float64)
+        self.high = df['High'].to_numpy(dtype=np.float64)
+        self.low = df['Low'].to_numpy(dtype=np.float64)
+        self.close = df['Close'].to_numpy(dtype=np.float64)
+        self.body = np.abs(self.close - self.open)
+        self.green = self.close > self.open
+        self.red = self.close < self.open
+        self.lower_wick = np.minimum(self.close, self.open) - self.low
+        self.upper_wick = self.high - np.maximum(self.close, self.open)
+
+    @staticmethod
+    def ago(x, n=1):
+        if x.dtype == bool:
+            out = np.zeros(x.shape, dtype=bool)
+        else:
+            out = np.full(x.shape, np.nan)
+        if n < len(x):
+            out[n:] = x[:len(x) - n]
+        return out
+
+# --- 2-CANDLE PATTERNS ---
+
+@pattern("Bullish Engulfing")
+def _bullish_engulfing(c):
+    # Yesterday Red, Today Green, Today engulfs Yesterday
+    return c.ago(c.red) & c.green & (c.close > c.ago(c.open)) & (c.open < c.ago(c.close))
+
+@pattern("Bearish Engulfing")
+def _bearish_engulfing(c):
+    # Yesterday Green, Today Red, Today engulfs Yesterday
+    return c.ago(c.green) & c.red & (c.open > c.ago(c.close)) & (c.close < c.ago(c.open))
+
+# --- SINGLE CANDLE PATTERNS ---
+
+@pattern("Hammer")
+def _hammer(c):
+    # Long lower wick (2x body), small upper wick
+    return (c.lower_wick > 2 * c.body) & (c.upper_wick < c.body * 0.5)
+
+@pattern("Shooting Star")
+def _shooting_star(c):
+    # Long upper wick (2x body), small lower wick
+    return (c.upper_wick > 2 * c.body) & (c.lower_wick < c.body * 0.5)
+
+# --- 3-CANDLE PATTERNS ---
+
+@pattern("Morning Star")
+def _morning_star(c):
+    # Big Red -> Small Body (Gap Down) -> Big Green (Gap Up)
+    first_mid = (c.ago(c.open, 2) + c.ago(c.close, 2)) / 2
+    return c.ago(c.red, 2) & c.green & (c.ago(c.body, 2) > c.ago(c.body) * 2) & (c.close > first_mid)
+
+@pattern("Evening Star")
+def _evening_star(c):
+    # Big Green -> Small Body (Gap Up) -> Big Red (Gap Down)
+    first_mid = (c.ago(c.open, 2) + c.ago(c.close, 2)) / 2
+    return c.ago(c.green, 2) & c.red & (c.ago(c.body, 2) > c.ago(c.body) * 2) & (c.close < first_mid)
+
+def detect_patterns(df, names=None):
+    """
+    Boolean (bars x patterns) DataFrame over the whole history of df.
+    names restricts it to some patterns (default: all registered ones).
+    """
+    candles = Candles(df)
+    names = list(PATTERNS) if names is None else names
+    return pd.DataFrame({name: PATTERNS[name](candles) for name in names}, index=df.index)
+
+def pattern_stats(df, horizon=5, matches=None):
+    """
+    Forward-return statistics per pattern: how often it fired, and the mean return /
+    hit rate over the next `horizon` bars after it did. matches = detect_patterns(df) if not given.
+    """
+    if matches is None:
+        matches = detect_patterns(df)
+    close = df['Close'].to_numpy(dtype=np.float64)
+    forward = np.full(len(close), np.nan)
+    if horizon < len(close):
+        forward[:-horizon] = close[horizon:] / close[:-horizon] - 1
+
+    rows = {}
+    for name in matches.columns:
+        hits = matches[name].to_numpy() & ~np.isnan(forward)
+        returns = forward[hits]
+        rows[name] = {
+            "count": int(matches[name].sum()),
+            "mean_return": float(returns.mean()) if len(returns) else np.nan,
+            "hit_rate": float((returns > 0).mean()) if len(returns) else np.nan,
+        }
+    return pd.DataFrame.from_dict(rows, orient="index")
@@ -0,0 +1,22 @@
+# src/periods.py
+import pandas as pd
+
+# How far back each yfinance period reaches
+PERIOD_OFFSETS = {
+    "1d": pd.DateOffset(days=1),
+    "5d": pd.DateOffset(days=5),
+    "1mo": pd.DateOffset(months=1),
+    "3mo": pd.DateOffset(months=3),
+    "6mo": pd.DateOffset(months=6),
+    "1y": pd.DateOffset(years=1),
+    "2y": pd.DateOffset(years=2),
+    "5y": pd.DateOffset(years=5),
+    "10y": pd.DateOffset(years=10),
+}
+
+def get_period_start(period, end):
+    """First timestamp inside a period window ending at 'end'. None means all history ('max')."""
+    if period == "ytd":
+        return pd.Timestamp(year=end.year, month=1, day=1, tz=end.tz)
+    offset = PERIOD_OFFSETS.get(period)
+    return end - offset if offset is not None else None
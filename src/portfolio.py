@@ -2,7 +2,7 @@
 import json
 import os
 from src.config import PAPER_TRADE_FILE
-from src.data_loader import fetch_data
+from src.data_loader import fetch_data_many
 from src.trade_executor import execute_trade
 
 def get_open_positions():
@@ -38,6 +38,9 @@ def check_for_exits():
     print("💼 Checking Portfolio for Exits...")
     portfolio = get_open_positions()
     messages = []
+
+    # One batched request for every holding's latest price
+    prices = fetch_data_many(list(portfolio), period="1d")
     
     for symbol, data in portfolio.items():
         qty = data["qty"]
@@ -45,7 +48,7 @@ def check_for_exits():
         
         # Get current market price
         try:
-            df = fetch_data(symbol, period="1d")
+            df = prices[symbol]
             if df.empty: continue
             current_price = float(df['Close'].iloc[-1])
         except:
@@ -0,0 +1,130 @@
+# src/providers.py
+import os
+import sys
+import time
+from abc import ABC, abstractmethod
+import pandas as pd
+import yfinance as yf
+from src.config import DATA_PROVIDER, REPLAY_DIR, REPLAY_LATENCY
+from src.cache_backends import BACKENDS, HAS_PYARROW, get_backend
+from src.periods import get_period_start
+from src.synthetic import make_synthetic_bars, symbol_seed
+
+class MarketDataProvider(ABC):
+    """
+    Where OHLCV comes from. download() follows yf.download's signature and
+    column layout, so callers can switch providers without other changes.
+    """
+    name = "base"
+
+    @abstractmethod
+    def download(self, tickers, period=None, start=None, group_by="column", **kwargs):
+        """Bars for one ticker or a list of them, laid out like yf.download."""
+
+    def history(self, symbol, **kwargs):
+        """Single-symbol download with flat OHLCV columns."""
+        df = self.download(symbol, **kwargs)
+        # Flatten MultiIndex (Fixes empty charts issue)
+        if isinstance(df.columns, pd.MultiIndex):
+            df.columns = df.columns.get_level_values(0)
+        return df
+
+class YahooProvider(MarketDataProvider):
+    """Live data from Yahoo Finance."""
+    name = "yahoo"
+
+    def download(self, tickers, **kwargs):
+        kwargs.setdefault("progress", False)
+        return yf.download(tickers, **kwargs)
+
+class LocalProvider(MarketDataProvider):
+    """
+    Offline provider. Replays bars recorded in `root` ({symbol}.parquet / .arrow / .csv),
+    or generates deterministic synthetic bars for symbols that weren't recorded.
+    `latency` (seconds) is slept on every download to mimic network round trips.
+    """
+    name = "local"
+
+    def __init__(self, root=REPLAY_DIR, latency=REPLAY_LATENCY, synthetic=True, end=None, n_bars=750):
+        self.root = root
+        self.latency = latency
+        self.synthetic = synthetic
+        self.end = end
+        self.n_bars = n_bars
+        self._frames = {}
+
+    def load_symbol(self, symbol):
+        if symbol not in self._frames:
+            df = None
+            for name, backend_cls in BACKENDS.items():
+                path = os.path.join(self.root, f"{symbol}.{backend_cls.extension}")
+                if os.path.exists(path) and (name == "csv" or HAS_PYARROW):
+                    df = backend_cls().load(path)
+                    break
+            if df is None and self.synthetic:
+                df = make_synthetic_bars(self.n_bars, seed=symbol_seed(symbol), end=self.end)
+            self._frames[symbol] = df
+        return self._frames[symbol]
+
+    def download(self, tickers, period=None, start=None, end=None, group_by="column", **kwargs):
+        if self.latency:
+            time.sleep(self.latency)
+
+        symbols = [tickers] if isinstance(tickers, str) else list(tickers)
+        frames = {}
+        for symbol in symbols:
+            df = self.load_symbol(symbol)
+            if df is None:
+                continue
+            if start is not None:
+                df = df[df.index >= pd.Timestamp(start)]
+            if end is not None:
+                df = df[df.index < pd.Timestamp(end)]
+            if period is not None and not df.empty:
+                period_start = get_period_start(period, df.index[-1])
+                if period_start is not None:
+                    df = df[df.index > period_start]
+            if not df.empty:
+                frames[symbol] = df
+
+        if not frames:
+            return pd.DataFrame()
+
+        # Same column layout as yf.download: (Ticker, Price) or (Price, Ticker)
+        out = pd.concat(frames, axis=1, names=["Ticker", "Price"])
+        if group_by != "ticker":
+            out = out.swaplevel(axis=1)
+        return out
+
+_PROVIDER = None
+
+def get_provider():
+    """The process-wide provider, picked by DATA_PROVIDER ('yahoo' or 'local')."""
+    global _PROVIDER
+    if _PROVIDER is None:
+        _PROVIDER = LocalProvider() if DATA_PROVIDER == "local" else YahooProvider()
+    return _PROVIDER
+
+def set_provider(provider):
+    """Swaps the provider (benchmarks, load tests, offline runs)."""
+    global _PROVIDER
+    _PROVIDER = provider
+
+def record(symbols, period="2y", root=REPLAY_DIR):
+    """Downloads bars from Yahoo and saves them for LocalProvider to replay."""
+    os.makedirs(root, exist_ok=True)
+    backend = get_backend()
+    yahoo = YahooProvider()
+    for symbol in symbols:
+        df = yahoo.history(symbol, period=period)
+        if df.empty:
+            print(f"   ⚠️ No data for {symbol}")
+            continue
+        backend.save(os.path.join(root, f"{symbol}.{backend.extension}"), df)
+        print(f"   💾 Recorded {symbol} ({len(df)} bars)")
+
+if __name__ == "__main__":
+    # python -m src.providers record [period]
+    if len(sys.argv) > 1 and sys.argv[1] == "record":
+        from src.sectors import get_stocks_by_sector
+        record(sorted(get_stocks_by_sector("All")), period=sys.argv[2] if len(sys.argv) > 2 else "2y")
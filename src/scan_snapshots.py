@@ -0,0 +1,121 @@
+# src/scan_snapshots.py
+import threading
+import time
+from datetime import datetime
+from src.config import SNAPSHOT_SECTORS, SNAPSHOT_INTERVAL, SNAPSHOT_POLL
+from src.data_loader import fetch_data_many
+from src.market_calendar import IST, OPEN, now_ist, session_state, is_session_final
+from src.panel import Panel
+from src.scanner import scan_market
+from src.sectors import SECTOR_MAP, get_stocks_by_sector
+from src.single_flight import SingleFlight
+
+class ScanSnapshots:
+    """
+    Latest scan_market() result per sector, so /scan answers without rescanning.
+    Each snapshot carries a generation number (bumped on every recompute of that sector)
+    and the time it was computed. Concurrent recomputes of a sector are coalesced, so the
+    dashboard and the scheduler asking at the same moment share one scan.
+    """
+    def __init__(self, sectors=()):
+        self._lock = threading.Lock()
+        self._snapshots = {}
+        self._tracked = set(sectors)
+        self._flights = SingleFlight()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def get(self, sector, fresh=False):
+        """Latest snapshot for the sector; computed now if there is none yet (or fresh=True)."""
+        with self._lock:
+            snapshot = self._snapshots.get(sector)
+        if snapshot is None or fresh:
+            snapshot = self.refresh(sector)
+        return snapshot
+
+    def refresh(self, sector):
+        return self._flights.do(sector, self._compute, sector)
+
+    def _compute(self, sector):
+        start = time.perf_counter()
+        panel = Panel.from_frames(fetch_data_many(get_stocks_by_sector(sector), period="1y"))
+        best, report = scan_market(sector, panel=panel)
+        now = now_ist()
+        snapshot = {
+            "sector": sector,
+            "computed_at": now.isoformat(),
+            "last_bar": panel.dates[-1].isoformat() if len(panel.dates) else None,
+            "scan_ms": round((time.perf_counter() - start) * 1000, 1),
+            "best_pick": best,
+            "market_data": report,
+        }
+        if sector != "All" and sector not in SECTOR_MAP:
+            return dict(snapshot, generation=0) # Unknown sector: answer, but don't keep it
+        with self._lock:
+            previous = self._snapshots.get(sector)
+            snapshot["generation"] = previous["generation"] + 1 if previous else 1
+            self._snapshots[sector] = snapshot
+            self._tracked.add(sector)
+        return snapshot
+
+    def is_stale(self, snapshot, now=None):
+        """
+        Same rules as the data cache (data_loader.is_fresh):
+        1. Market open -> rescan every SNAPSHOT_INTERVAL seconds
+        2. Closed and the snapshot already has the final bar of the last session -> keep it
+        3. Closed but not final yet -> rescan every SNAPSHOT_INTERVAL seconds until it is
+        """
+        now = now_ist() if now is None else now
+        computed_at = datetime.fromisoformat(snapshot["computed_at"])
+        age = (now - computed_at).total_seconds()
+        if session_state(now) == OPEN or snapshot["last_bar"] is None:
+            return age >= SNAPSHOT_INTERVAL
+
+        last_bar = datetime.fromisoformat(snapshot["last_bar"])
+        last_bar_day = (last_bar.astimezone(IST) if last_bar.tzinfo else last_bar).date()
+        if is_session_final(last_bar_day, computed_at, now):
+            return False
+        return age >= SNAPSHOT_INTERVAL
+
+    def refresh_stale(self):
+        """Recomputes every tracked sector that has no snapshot or a stale one."""
+        with self._lock:
+            due = [s for s in self._tracked
+                   if s not in self._snapshots or self.is_stale(self._snapshots[s])]
+        for sector in due:
+            if self._stop.is_set():
+                break
+            try:
+                snapshot = self.refresh(sector)
+                print(f"   📸 Scan snapshot {sector} #{snapshot['generation']} "
+                      f"({len(snapshot['market_data'])} picks, {snapshot['scan_ms']} ms)")
+            except Exception as e:
+                print(f"   ⚠️ Scan snapshot {sector} failed: {e}")
+        return due
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.refresh_stale()
+            self._stop.wait(SNAPSHOT_POLL)
+
+    def start(self):
+        """Starts the background refresher (a daemon thread, checks every SNAPSHOT_POLL seconds)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="scan-snapshots", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self._thread = None
+
+    def stats(self):
+        with self._lock:
+            return {sector: {"generation": s["generation"], "computed_at": s["computed_at"],
+                             "last_bar": s["last_bar"], "scan_ms": s["scan_ms"]}
+                    for sector, s in self._snapshots.items()}
+
+SNAPSHOTS = ScanSnapshots(SNAPSHOT_SECTORS)
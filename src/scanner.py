@@ -1,38 +1,28 @@
 # src/scanner.py
-import joblib
-import os
+import multiprocessing
+import threading
 import pandas as pd
-import ta
 import numpy as np
-from src.data_loader import fetch_data
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from src.data_loader import fetch_data, fetch_data_many
 from src.news_analyzer import NewsAnalyzer
-from src.indicators import check_candlestick_patterns, add_indicators
-from src.config import MODEL_PATH
+from src.config import SCAN_WORKERS, SCAN_CHUNK_SIZE
 from src.sectors import get_stocks_by_sector
 from src.calculator import calculate_delivery_costs
-from src.market_analyzer import get_market_condition
-from src.indicators import check_candlestick_patterns, add_indicators, check_breakout
+from src.market_analyzer import get_market_condition, classify_market, MARKET_INDICATORS
+from src.indicators import check_candlestick_patterns, classify_breakout, FEATURES
+from src.feature_cache import get_indicators
+from src.model_registry import MODELS
+from src.batch_inference import predict_signals
+from src.panel import Panel, load_panel
+from src.panel_indicators import panel_indicators, latest, MIN_BARS
 
-def get_ai_prediction(symbol, df):
-    try:
-        clean_symbol = symbol.replace('.NS', '')
-        model_file = f"{MODEL_PATH}/{clean_symbol}_model.pkl"
-        
-        if not os.path.exists(model_file): return 0
-        model = joblib.load(model_file)
-        
-        # Calculate indicators exactly how we trained them
-        df['RSI'] = ta.momentum.rsi(df['Close'], window=14)
-        df['SMA_20'] = ta.trend.sma_indicator(df['Close'], window=20)
-        df['SMA_50'] = ta.trend.sma_indicator(df['Close'], window=50)
-        
-        features = ['RSI', 'SMA_20', 'SMA_50', 'Close', 'Volume']
-        last_row = df[features].iloc[[-1]]
-        
-        # Convert numpy int64 to python int
-        return int(model.predict(last_row)[0])
-    except Exception:
-        return 0
+# Indicator columns each path reads (only these and their dependencies get computed)
+SCAN_INDICATORS = ['SuperTrend_Signal', 'VWAP', 'RSI', 'ADX', 'ATR',
+                   'SMA_20', 'SMA_50', 'Range_High', 'Range_Low', 'Volume_Avg']
+ANALYZE_INDICATORS = ['SuperTrend', 'SuperTrend_Signal', 'EMA_Slow', 'ADX', 'RSI', 'MACD',
+                      'VWAP', 'OBV', 'ATR'] + MARKET_INDICATORS
 
 def analyze_single_stock(symbol):
     """
@@ -46,7 +36,7 @@ def analyze_single_stock(symbol):
         df = fetch_data(symbol, period="1y")
         if df.empty: return {"error": "No Data Found"}
 
-        df = add_indicators(df)
+        df = get_indicators(symbol, df, ANALYZE_INDICATORS)
         curr = df.iloc[-1]
         prev = df.iloc[-2]
         
@@ -147,23 +137,114 @@ def analyze_single_stock(symbol):
     except Exception as e:
         return {"error": str(e)}
 
-def scan_market(sector="All"):
+def scan_market(sector="All", panel=None, symbols=None, workers=None, chunk_size=None):
+    """
+    Scores every stock in the sector (or in `symbols`, if given).
+    Pass a src.panel.Panel to read bars straight from the shared memmap instead of the cache.
+    Indicators for the whole sector come from one cross-sectional pass (src/panel_indicators.py).
+    workers > 1 shards the symbols across a process pool, chunk_size symbols per task
+    (defaults: SCAN_WORKERS / SCAN_CHUNK_SIZE); results are the same as a serial scan.
+    """
     print(f"[INFO] Senior Quant Analyzing Sector: {sector}...")
     news_bot = NewsAnalyzer()
     
-    stock_list = get_stocks_by_sector(sector)
-    report = []
+    stock_list = get_stocks_by_sector(sector) if symbols is None else list(symbols)
+
+    if panel is None:
+        # Download every cache miss in a few batched requests instead of one per symbol
+        panel = Panel.from_frames(fetch_data_many(stock_list, period="1y"))
+    if len(panel) == 0:
+        return None, []
+
+    stock_list = [s for s in stock_list if s in panel]
+    workers = SCAN_WORKERS if workers is None else workers
+    chunk_size = SCAN_CHUNK_SIZE if chunk_size is None else chunk_size
+    if workers > 1 and len(stock_list) > chunk_size:
+        report = score_parallel(stock_list, panel, workers, chunk_size)
+    else:
+        report = score_symbols(stock_list, panel)
+
+    if report:
+        report = sorted(report, key=lambda x: x['score'], reverse=True)
+        return report[0], report
+    return None, []
+
+def scan_market_stream(sector="All", panel=None, symbols=None, chunk_size=None):
+    """
+    Streaming scan_market(): a generator of (event, data) pairs, so callers can show
+    results while the rest of the sector is still being scanned.
+      ("entry", entry)      - a stock that passed the threshold, as soon as it is scored
+      ("progress", {...})   - after every chunk: scanned / total / found
+      ("done", {...})       - last event: best_pick (same as scan_market's) and counts
+    Symbols go chunk_size at a time (default SCAN_CHUNK_SIZE): each chunk is fetched and
+    gets its own indicator pass, so the first entries don't wait for the whole sector.
+    """
+    print(f"[INFO] Streaming scan of sector: {sector}...")
+    stock_list = get_stocks_by_sector(sector) if symbols is None else list(symbols)
+    if panel is not None:
+        stock_list = [s for s in stock_list if s in panel]
+    chunk_size = SCAN_CHUNK_SIZE if chunk_size is None else max(1, chunk_size)
+
+    total = len(stock_list)
+    scanned = 0
+    found = 0
+    best = None
+    for i in range(0, total, chunk_size):
+        shard = stock_list[i:i + chunk_size]
+        if panel is None:
+            shard_panel = Panel.from_frames(fetch_data_many(shard, period="1y"))
+        else:
+            shard_panel = panel.subset(shard)
+
+        for entry in iter_scores(shard, shard_panel):
+            found += 1
+            if best is None or entry['score'] > best['score']: # First of the top score, as in scan_market
+                best = entry
+            yield "entry", entry
+
+        scanned += len(shard)
+        yield "progress", {"scanned": scanned, "total": total, "found": found}
+
+    yield "done", {"best_pick": best, "found": found, "total": total}
+
+def score_symbols(stock_list, panel):
+    """
+    Scores stock_list from the bars in panel. Returns the entries that pass the
+    threshold, in stock_list order.
+    """
+    return list(iter_scores(stock_list, panel))
+
+def iter_scores(stock_list, panel):
+    """Generator behind score_symbols(): yields each passing entry as soon as it is scored."""
+    # One vectorized indicator pass over the whole universe (src/panel_indicators.py),
+    # then each symbol is scored from its latest bar
+    indicators = panel_indicators(panel, SCAN_INDICATORS)
+    close = panel.close.T
+    bars = (~np.isnan(close)).sum(axis=0)
+    latest_values = {name: latest(values, close) for name, values in indicators.items()}
+    latest_values['Close'] = latest(close, close)
+    latest_values['Volume'] = latest(panel.field("Volume").T, close)
 
+    # AI signals for the whole list in one batched inference pass (src/batch_inference.py),
+    # from the same latest-bar FEATURES the model was trained on
+    rows = {}
     for symbol in stock_list:
-        try:
-            df = fetch_data(symbol, period="1y")
-            if df.empty: continue
+        if symbol in panel and bars[panel.index_of(symbol)] >= MIN_BARS:
+            j = panel.index_of(symbol)
+            rows[symbol] = [latest_values[name][j] for name in FEATURES]
+    ai_signals = predict_signals(rows)
 
-            df = add_indicators(df)
-            current = df.iloc[-1]
+    for symbol in stock_list:
+        try:
+            if symbol not in panel: continue
+            j = panel.index_of(symbol)
+            if bars[j] < MIN_BARS: continue # Too short for ADX (add_indicators raised here)
+            current = {name: values[j] for name, values in latest_values.items()}
             
             # Use same logic as single stock analysis
-            market_cond = get_market_condition(df)
+            market_cond = "UNKNOWN"
+            if bars[j] >= 50:
+                market_cond = classify_market(current['Close'], current['SMA_20'], current['SMA_50'], current['ADX'])
             
             # Quick Signal Check
             score = 0
@@ -192,13 +273,14 @@ def scan_market(sector="All"):
                 reasons.append("Strong Trend")
                 
             # 5. Breakout
-            breakout = check_breakout(df)
+            breakout = classify_breakout(current['Close'], current['Volume'], current['Range_High'],
+                                         current['Range_Low'], current['Volume_Avg'])
             if breakout and "Bullish" in breakout:
                 score += 25
                 reasons.append("Breakout Detected")
             
             # 6. AI Model Prediction (Existing)
-            ai_sig = get_ai_prediction(symbol, df)
+            ai_sig = ai_signals.get(symbol, 0)
             if ai_sig == 1:
                 score += 15
                 reasons.append("AI Model")
@@ -229,14 +311,93 @@ def scan_market(sector="All"):
                     "patterns": market_cond, 
                     "indicators": f"ADX:{int(current['ADX'])} RSI:{int(current['RSI'])} ST:{'Green' if current['SuperTrend_Signal'] else 'Red'}"
                 }
-                report.append(entry)
                 print(f"   🔎 {symbol}: Score {confidence}%")
+                yield entry
 
         except Exception as e:
             # print(f"   ❌ Error {symbol}: {e}")
             pass
 
-    if report:
-        report = sorted(report, key=lambda x: x['score'], reverse=True)
-        return report[0], report
-    return None, []
\ No newline at end of file
+# --- Parallel scan ---
+# Symbols are split into shards of chunk_size; each worker process scores a whole shard
+# (one indicator pass + per-symbol scoring). The pool is kept for the life of the process,
+# so workers load the scanner and its libraries once, not per scan or per symbol.
+# Workers come from a forkserver (spawn where that's missing), never a plain fork: the
+# server runs threads holding locks (caches, model registry, snapshot refresher) and a
+# child forked while one is held would deadlock.
+_POOL = None
+_POOL_KEY = None
+_POOL_LOCK = threading.Lock()
+
+class PanelChanged(RuntimeError):
+    """The memmap panel was rebuilt between the scan starting and a worker opening it."""
+
+def _init_scan_worker(model_dir):
+    """Pool initializer: workers start fresh, so pass on what the parent set at runtime."""
+    MODELS.model_dir = model_dir
+
+def get_scan_pool(workers):
+    global _POOL, _POOL_KEY
+    key = (workers, MODELS.model_dir)
+    with _POOL_LOCK:
+        if _POOL is None or _POOL_KEY != key:
+            if _POOL is not None:
+                _POOL.shutdown(wait=False)
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+            _POOL = ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                        initializer=_init_scan_worker, initargs=(MODELS.model_dir,))
+            _POOL_KEY = key
+        return _POOL
+
+def shutdown_scan_pool():
+    global _POOL, _POOL_KEY
+    with _POOL_LOCK:
+        if _POOL is not None:
+            _POOL.shutdown(wait=True)
+        _POOL = None
+        _POOL_KEY = None
+
+_WORKER_PANELS = {} # panel_dir -> Panel, opened once per worker
+
+def _score_shard(job):
+    """
+    Worker entry point. job is either
+      ("memmap", panel_dir, version, symbols, indices) - open the shared panel and slice it
+      ("data", symbols, (fields x symbols x dates) array, dates) - in-memory panel shard
+    """
+    if job[0] == "memmap":
+        _, panel_dir, version, symbols, indices = job
+        panel = _WORKER_PANELS.get(panel_dir)
+        if panel is None or panel.version != version:
+            panel = _WORKER_PANELS[panel_dir] = load_panel(panel_dir)
+        if panel is None or panel.version != version:
+            raise PanelChanged(f"{panel_dir} changed during the scan")
+        return score_symbols(symbols, Panel(panel.data[:, indices, :], symbols, panel.dates))
+
+    _, symbols, data, dates = job
+    return score_symbols(symbols, Panel(data, symbols, dates))
+
+def score_parallel(stock_list, panel, workers, chunk_size):
+    """
+    score_symbols() over a process pool. Shards come back in submission order, so the
+    report is identical to the serial one. Falls back to serial if the pool can't run.
+    A memmap panel (load_panel) isn't copied: workers open the same file and slice it.
+    """
+    jobs = []
+    for i in range(0, len(stock_list), chunk_size):
+        shard = stock_list[i:i + chunk_size]
+        if panel.path is not None:
+            jobs.append(("memmap", panel.path, panel.version, shard, [panel.index_of(s) for s in shard]))
+        else:
+            sub = panel.subset(shard)
+            jobs.append(("data", sub.symbols, sub.data, sub.dates))
+
+    try:
+        results = list(get_scan_pool(workers).map(_score_shard, jobs))
+    except (OSError, BrokenProcessPool, PanelChanged) as e:
+        print(f"   ⚠️ Parallel scan unavailable ({e}), scanning serially")
+        if not isinstance(e, PanelChanged):
+            shutdown_scan_pool()
+        return score_symbols(stock_list, panel)
+    return [entry for shard_report in results for entry in shard_report]
@@ -2,11 +2,16 @@
 from src.portfolio import check_for_exits
 from src.trade_executor import execute_trade, get_balance
 from fastapi import FastAPI, Header, HTTPException
+from fastapi.responses import StreamingResponse
 from src.config import MOBILE_API_KEY, PAPER_TRADE_FILE
-from src.scanner import scan_market, analyze_single_stock
+from src.scanner import scan_market_stream, analyze_single_stock
 from src.trade_executor import execute_trade
 from src.utils import ensure_directories_exist
 from src.sectors import SECTOR_MAP
+from src.data_loader import get_cache_stats
+from src.feature_cache import get_feature_cache_stats
+from src.scan_snapshots import SNAPSHOTS
+from src.model_registry import get_model_stats
 import json
 import os
 
@@ -19,15 +24,38 @@ def verify_key(x_api_key: str = Header(None)):
 @app.on_event("startup")
 def startup_event():
     ensure_directories_exist()
+    SNAPSHOTS.start()
+
+@app.on_event("shutdown")
+def shutdown_event():
+    SNAPSHOTS.stop()
 
 @app.get("/")
 def home(): return {"message": "AI Trading Bot is Online 🤖"}
 
 @app.get("/scan")
-def run_scan(sector: str = "All", x_api_key: str = Header(None)):
+def run_scan(sector: str = "All", fresh: bool = False, x_api_key: str = Header(None)):
+    verify_key(x_api_key)
+    # Served from the background snapshot; fresh=true rescans now
+    snapshot = SNAPSHOTS.get(sector, fresh=fresh)
+    return {"best_pick": snapshot["best_pick"], "market_data": snapshot["market_data"],
+            "generation": snapshot["generation"], "computed_at": snapshot["computed_at"]}
+
+@app.get("/scan/stream")
+def stream_scan(sector: str = "All", x_api_key: str = Header(None)):
+    """
+    Server-sent events version of /scan: an "entry" event per stock as soon as it is
+    scored, "progress" after every chunk and a final "done" event with the best pick.
+    """
     verify_key(x_api_key)
-    best, full_report = scan_market(sector)
-    return {"best_pick": best, "market_data": full_report}
+
+    def events():
+        for event, data in scan_market_stream(sector):
+            yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+    # no-cache / no buffering so proxies pass each event through immediately
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
 @app.get("/analyze/{symbol}")
 def analyze_stock(symbol: str, x_api_key: str = Header(None)):
@@ -42,6 +70,15 @@ def analyze_stock(symbol: str, x_api_key: str = Header(None)):
 def get_sectors():
     return {"sectors": list(SECTOR_MAP.keys())}
 
+@app.get("/cache/stats")
+def cache_stats(x_api_key: str = Header(None)):
+    verify_key(x_api_key)
+    stats = get_cache_stats()
+    stats["features"] = get_feature_cache_stats()
+    stats["scan_snapshots"] = SNAPSHOTS.stats()
+    stats["models"] = get_model_stats()
+    return stats
+
 @app.post("/trade/{symbol}")
 def place_trade(symbol: str, action: str, qty: int, price: float, stop_loss: float = 0.0, target: float = 0.0, x_api_key: str = Header(None)):
     verify_key(x_api_key)
@@ -0,0 +1,63 @@
+# src/single_flight.py
+import threading
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """
+    Request coalescing across threads. While a call for `key` is in flight,
+    other callers for the same key wait for it and share its result instead
+    of doing the same work (download + cache write) again.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.leaders = 0    # Calls that actually ran
+        self.coalesced = 0  # Calls that piggybacked on one already in flight
+
+    def claim(self, key):
+        """Returns (call, is_leader). A leader MUST call finish(key, ...) when done."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                return call, False
+            call = _Call()
+            self._calls[key] = call
+            self.leaders += 1
+            return call, True
+
+    def finish(self, key, result=None, error=None):
+        with self._lock:
+            call = self._calls.pop(key)
+        call.result = result
+        call.error = error
+        call.done.set()
+
+    @staticmethod
+    def wait(call):
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def do(self, key, func, *args, **kwargs):
+        """Runs func once per key at a time; concurrent callers get the same result."""
+        call, is_leader = self.claim(key)
+        if not is_leader:
+            return self.wait(call)
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            self.finish(key, error=e)
+            raise
+        self.finish(key, result=result)
+        return result
+
+    def stats(self):
+        with self._lock:
+            return {"leaders": self.leaders, "coalesced": self.coalesced, "in_flight": len(self._calls)}
@@ -0,0 +1,23 @@
+# src/synthetic.py
+import zlib
+import numpy as np
+import pandas as pd
+
+def symbol_seed(symbol):
+    """Stable seed per symbol (hash() is randomized between runs)."""
+    return zlib.crc32(symbol.encode())
+
+def make_synthetic_bars(n_bars=500, seed=0, end=None, start_price=1000.0):
+    """Random-walk OHLCV that looks like a yfinance daily frame."""
+    rng = np.random.default_rng(seed)
+    end = pd.Timestamp.today().normalize() if end is None else pd.Timestamp(end).normalize()
+    dates = pd.bdate_range(end=end, periods=n_bars, name="Date")
+    close = start_price * np.exp(np.cumsum(rng.normal(0, 0.015, n_bars)))
+    open_ = close * (1 + rng.normal(0, 0.005, n_bars))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.008, n_bars)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.008, n_bars)))
+    volume = rng.integers(100_000, 20_000_000, n_bars)
+    return pd.DataFrame(
+        {"Close": close, "High": high, "Low": low, "Open": open_, "Volume": volume},
+        index=dates,
+    )